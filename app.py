@@ -1,17 +1,29 @@
-from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, BackgroundTasks, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from twilio.twiml.voice_response import VoiceResponse, Gather, Start, Stream
 from dotenv import load_dotenv
 from llm import ConcyaLLMClient
+from llm.client import SENTENCE_BOUNDARY
 from tts import ConcyaTTSClient
 from restaurant import RestaurantBookingSystem, ConversationManager
 import os
-from datetime import datetime
+import re
+import orjson
+from contextlib import asynccontextmanager
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import date
 import time
-import uuid
+import itertools
 import logging
 import asyncio
+import gzip
+import hashlib
+import hmac
+import heapq
+import random
 
 # Configure logging
 logging.basicConfig(
@@ -20,28 +32,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger("concya")
 
+# Log-correlation ids for requests without a CallSid; unique within the process
+CONVERSATION_IDS = itertools.count(1)
+
+def short_id():
+    """Next 8-character hex id for log correlation"""
+    return f"{next(CONVERSATION_IDS):08x}"
+
 # Timing utilities
 class TimingContext:
     def __init__(self, operation_name, conversation_id=None):
         self.operation_name = operation_name
-        self.conversation_id = conversation_id or str(uuid.uuid4())[:8]
+        self.conversation_id = conversation_id or short_id()
         self.start_time = None
         self.end_time = None
 
     def __enter__(self):
-        self.start_time = time.time()
-        logger.info(f"⏱️ [{self.conversation_id}] START {self.operation_name}")
+        self.start_time = time.perf_counter()
+        logger.debug("⏱️ [%s] START %s", self.conversation_id, self.operation_name)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
         duration = self.end_time - self.start_time
-        logger.info(".3f")
+        log_latency(self.operation_name, duration, self.conversation_id)
 
 def log_latency(operation_name, duration, conversation_id=None):
     """Log latency with consistent formatting"""
     conv_id = conversation_id or "unknown"
-    logger.info(".3f")
+    logger.info("⏱️ [%s] %s: %.3fs", conv_id, operation_name, duration)
+
+# Caller phrases that end the call, and reply cues that pick the follow-up prompt style;
+# each list is fused into one alternation so a single scan replaces the any() loops
+END_CALL_PHRASES = ("goodbye", "bye", "see you", "talk to you later", "hang up", "end call", "that's all")
+END_CALL_PATTERN = re.compile("|".join(map(re.escape, END_CALL_PHRASES)), re.IGNORECASE)
+QUESTION_CUE_PATTERN = re.compile("|".join(map(re.escape, ["?", "what", "how", "tell me"])), re.IGNORECASE)
+EXCITED_CUE_PATTERN = re.compile("|".join(map(re.escape, ["!", "great", "wonderful", "amazing"])), re.IGNORECASE)
+LONG_REPLY_WORDS = 30  # replies with more words than this get the long-reply prompts
+
+# Listening prompts played after a reply, by reply style; "" means listen silently.
+# Repeated entries weight the choice, built once instead of per turn.
+QUESTION_FOLLOW_UPS = ("", "Go ahead", "I'm listening") + ("",) * 4  # mostly silent
+EXCITED_FOLLOW_UPS = ("Tell me more", "What else?", "Go on")
+LONG_REPLY_FOLLOW_UPS = ("", "What do you think?", "Any questions?") + ("",) * 3
+DEFAULT_FOLLOW_UPS = ("Go ahead", "I'm listening", "What would you like to know?", "Yes?", "Tell me more")
+
+GREETING_TEXT = "Hello! Welcome to Bella Vista, where authentic Italian meets modern elegance. How can I help you with your reservation today?"
+GOODBYE_TEXT = "Goodbye! It was nice talking to you."
+SILENT_PROMPT_TEXT = "..."  # very brief, subtle sound for "silent" listening
+
+# Fixed lines synthesized at startup so no caller waits on TTS for them
+STATIC_TTS_PHRASES = tuple(dict.fromkeys(
+    phrase
+    for phrase in (GREETING_TEXT, GOODBYE_TEXT, SILENT_PROMPT_TEXT,
+                   *QUESTION_FOLLOW_UPS, *EXCITED_FOLLOW_UPS, *LONG_REPLY_FOLLOW_UPS, *DEFAULT_FOLLOW_UPS)
+    if phrase
+))
+
+def split_sentences(text):
+    """Split a reply into sentences for per-sentence TTS"""
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text.strip()) if sentence]
 
 def get_conversation_id(request):
     """Extract or generate conversation ID from request"""
@@ -49,11 +99,72 @@ def get_conversation_id(request):
     call_sid = request.headers.get('X-Twilio-CallSid') or getattr(request, 'headers', {}).get('X-Twilio-CallSid')
     if call_sid:
         return call_sid[-8:]  # Last 8 chars of CallSid
-    return str(uuid.uuid4())[:8]
+    return short_id()
 
 load_dotenv()
 
-app = FastAPI(title="Concya Twilio Gateway", version="1.0.0")
+# Public prefix Twilio fetches synthesized audio from (ngrok URL by default)
+PUBLIC_AUDIO_BASE = os.getenv("PUBLIC_WEBHOOK_URL", "https://53453cec9732.ngrok-free.app").rstrip("/") + "/audio/"
+
+def public_audio_url(audio_path):
+    """Public URL for a file in the audio cache"""
+    return PUBLIC_AUDIO_BASE + os.path.basename(audio_path)
+
+# Worker threads for blocking work (Supabase, SMTP, Twilio) offloaded from handlers
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "32"))
+# uvicorn worker processes; more than one needs the Redis conversation store
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Dashboard page is static, so it is read once at startup and served from memory
+DASHBOARD_HTML_PATH = Path(__file__).parent / "restaurant" / "dashboard.html"
+DASHBOARD_FALLBACK_HTML = "<h1>Dashboard not available</h1>"
+DASHBOARD_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+DASHBOARD_GZIP_HEADERS = {**DASHBOARD_CACHE_HEADERS, "Content-Encoding": "gzip"}
+DASHBOARD_ETAG = None  # weak content hash (shared by the gzip variant), lets browsers revalidate with a 304 instead of a re-download
+DASHBOARD_HTML = None
+DASHBOARD_HTML_GZ = None  # compressed once at startup for clients that accept gzip
+
+async def prewarm_static_tts():
+    """Synthesize the fixed greeting, goodbye and listening prompts into the TTS cache"""
+    start_time = time.perf_counter()
+    audio_paths = await asyncio.gather(*(tts_client.agenerate_speech(phrase, voice="alloy") for phrase in STATIC_TTS_PHRASES))
+    logger.info("🔥 Pre-warmed %d/%d static TTS phrases (%.3fs)",
+                sum(1 for path in audio_paths if path), len(STATIC_TTS_PHRASES), time.perf_counter() - start_time)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global DASHBOARD_HTML, DASHBOARD_HTML_GZ, DASHBOARD_ETAG
+    # In-memory conversations are per process: turns of one call landing on different
+    # workers would silently lose their booking state, so refuse to start instead
+    if WEB_CONCURRENCY > 1 and conversation_manager.redis is None:
+        logger.error("❌ WEB_CONCURRENCY=%d needs REDIS_URL (and the redis package) for shared conversation state", WEB_CONCURRENCY)
+        raise RuntimeError("WEB_CONCURRENCY > 1 requires REDIS_URL")
+    # uvloop is selected by the server command (--loop uvloop); confirm it took effect
+    loop = asyncio.get_running_loop()
+    logger.info("🔁 Event loop: %s", type(loop).__module__)
+    # asyncio.to_thread runs conversation turns and Supabase calls here; size it for
+    # concurrent calls rather than the CPU-count default
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="gateway"))
+    DASHBOARD_HTML = DASHBOARD_HTML_PATH.read_bytes() if DASHBOARD_HTML_PATH.exists() else None
+    if DASHBOARD_HTML is None:
+        logger.warning("⚠️ Dashboard HTML not found at %s", DASHBOARD_HTML_PATH)
+    else:
+        DASHBOARD_HTML_GZ = gzip.compress(DASHBOARD_HTML, compresslevel=9)
+        DASHBOARD_ETAG = f'W/"{hashlib.blake2b(DASHBOARD_HTML, digest_size=16).hexdigest()}"'
+        DASHBOARD_CACHE_HEADERS["ETag"] = DASHBOARD_GZIP_HEADERS["ETag"] = DASHBOARD_ETAG
+    # Warm the TTS cache in the background so startup isn't held on OpenAI
+    prewarm_task = asyncio.create_task(prewarm_static_tts())
+    yield
+    prewarm_task.cancel()
+    await tts_client.aclose()
+    await llm_client.aclose()
+
+app = FastAPI(
+    title="Concya Twilio Gateway",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Mount static files for audio serving
 app.mount("/audio", StaticFiles(directory="audio_cache"), name="audio")
@@ -67,35 +178,47 @@ conversation_manager = ConversationManager()
 # WebSocket connection to WhisperLiveKit server
 whisper_ws_url = os.getenv("WHISPER_SERVER_URL", "wss://your-runpod-url.proxy.runpod.net/media")
 active_whisper_connections = {}
+BRIDGE_SEND_QUEUE_SIZE = 64  # pending outbound messages per transcription bridge
+
+# Shared secret for /ws/conversation_stream, which drives paid LLM and TTS calls; unset disables the endpoint
+CONVERSATION_STREAM_TOKEN = os.getenv("CONVERSATION_STREAM_TOKEN", "")
+CONVERSATION_STREAM_MAX_CONNECTIONS = int(os.getenv("CONVERSATION_STREAM_MAX_CONNECTIONS", "8"))
+CONVERSATION_STREAM_MIN_TURN_INTERVAL_S = 1.0  # per-connection floor between replies
+CONVERSATION_STREAM_MAX_TEXT_CHARS = 1000  # longer messages are rejected unprocessed
+CONVERSATION_STREAM_HISTORY_MESSAGES = 8  # earlier user/assistant messages sent with each turn
+active_conversation_streams = 0
+
+# Health payload never changes, so it is serialized once instead of per probe
+ROOT_STATUS_JSON = orjson.dumps({
+    "status": "healthy",
+    "service": "Concya Twilio Gateway",
+    "version": "1.0.0",
+    "active_connections": 0
+})
 
 @app.get("/")
 async def root():
-    return {
-        "status": "healthy",
-        "service": "Concya Twilio Gateway",
-        "version": "1.0.0",
-        "active_connections": 0
-    }
+    return Response(content=ROOT_STATUS_JSON, media_type="application/json")
 
 @app.post("/twilio")
 async def handle_call(request: Request):
     conversation_id = get_conversation_id(request)
-    total_start = time.time()
+    total_start = time.perf_counter()
 
-    logger.info(f"📞 [{conversation_id}] INCOMING CALL - Webhook received")
+    logger.info("📞 [%s] INCOMING CALL - Webhook received", conversation_id)
 
     response = VoiceResponse()
 
     # Use TTS for the restaurant greeting
-    greeting_text = "Hello! Welcome to Bella Vista, where authentic Italian meets modern elegance. How can I help you with your reservation today?"
+    greeting_text = GREETING_TEXT
 
     with TimingContext("Greeting TTS Generation", conversation_id):
-        greeting_audio_path = tts_client.generate_speech(greeting_text, voice="alloy")
+        greeting_audio_path = await tts_client.agenerate_speech(greeting_text, voice="alloy")
 
     if greeting_audio_path:
-        greeting_audio_url = f"https://53453cec9732.ngrok-free.app/audio/{os.path.basename(greeting_audio_path)}"
+        greeting_audio_url = public_audio_url(greeting_audio_path)
         response.play(greeting_audio_url)
-        logger.info(f"🎵 [{conversation_id}] Playing greeting TTS: {greeting_audio_url}")
+        logger.info("🎵 [%s] Playing greeting TTS: %s", conversation_id, greeting_audio_url)
     else:
         # Fallback to text-to-speech
         response.say(greeting_text)
@@ -106,94 +229,232 @@ async def handle_call(request: Request):
     start.stream(url=whisper_ws_url)
     response.append(start)
 
-    total_duration = time.time() - total_start
-    logger.info(f"🏁 [{conversation_id}] END Webhook Processing ({total_duration:.3f}s)")
+    total_duration = time.perf_counter() - total_start
+    logger.info("🏁 [%s] END Webhook Processing (%.3fs)", conversation_id, total_duration)
 
     return Response(content=str(response), media_type="text/xml")
 
+async def drain_outbox(websocket: WebSocket, outbox: asyncio.Queue, conversation_id: str):
+    """Send queued messages so producers never wait on socket backpressure"""
+    try:
+        while True:
+            message = await outbox.get()
+            await websocket.send_text(message)
+    except Exception as e:
+        # Producers see writer_task.done() and end the bridge instead of queueing into nothing
+        logger.warning("⚠️ [%s] Transcription bridge send failed: %s", conversation_id, e)
+
+def queue_bridge_message(outbox: asyncio.Queue, writer_task: asyncio.Task, message: str):
+    """Hand a message to the bridge writer, failing fast if it has stopped or the client stopped reading"""
+    if writer_task.done():
+        raise ConnectionError("transcription bridge writer stopped")
+    try:
+        outbox.put_nowait(message)
+    except asyncio.QueueFull:
+        raise ConnectionError("transcription bridge client is not reading")
+
 @app.websocket("/ws/transcription/{call_sid}")
 async def transcription_bridge(websocket: WebSocket, call_sid: str):
     """Bridge between Twilio and WhisperLiveKit - receives transcriptions"""
     await websocket.accept()
     conversation_id = call_sid[-8:]
-    logger.info(f"🔗 [{conversation_id}] Transcription bridge connected")
+    logger.info("🔗 [%s] Transcription bridge connected", conversation_id)
     
     # Store connection
     active_whisper_connections[call_sid] = {
         "websocket": websocket,
         "connected_at": time.time()
     }
+
+    outbox = asyncio.Queue(maxsize=BRIDGE_SEND_QUEUE_SIZE)
+    writer_task = asyncio.create_task(drain_outbox(websocket, outbox, conversation_id))
     
     try:
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             
             if data.get("event") == "transcription":
                 transcription_text = data["transcription"]["text"]
-                logger.info(f"📝 [{conversation_id}] Received: {transcription_text}")
+                logger.info("📝 [%s] Received: %s", conversation_id, transcription_text)
                 
                 # Get phone number from stored connection or default
                 phone_number = data.get("phone_number", "unknown")
                 
                 # Process with conversation manager
                 with TimingContext("LLM Processing", conversation_id):
-                    ai_response, state = conversation_manager.process_conversation_turn(
+                    # Turns hit Supabase for availability and bookings; keep that off the loop
+                    ai_response, state = await asyncio.to_thread(
+                        conversation_manager.process_conversation_turn,
                         phone_number, transcription_text, booking_system
                     )
                 
-                logger.info(f"🤖 [{conversation_id}] AI response: '{ai_response[:100]}...'")
+                logger.info("🤖 [%s] AI response: '%.100s...'", conversation_id, ai_response)
                 
-                # Generate TTS and send back
-                with TimingContext("Response TTS Generation", conversation_id):
-                    audio_path = tts_client.generate_speech(ai_response, voice="alloy")
-                
-                if audio_path:
-                    # Get ngrok URL from environment or use default
-                    ngrok_url = os.getenv("PUBLIC_WEBHOOK_URL", "https://53453cec9732.ngrok-free.app")
-                    audio_url = f"{ngrok_url}/audio/{os.path.basename(audio_path)}"
-                    
-                    await websocket.send_json({
-                        "event": "response",
-                        "audio_url": audio_url,
-                        "text": ai_response
-                    })
-                    logger.info(f"🎵 [{conversation_id}] Sent response audio: {audio_url}")
+                # Synthesize all sentences concurrently and send each one in order as soon
+                # as it is ready, so playback starts before the whole reply is synthesized
+                sentences = split_sentences(ai_response)
+                tts_tasks = [
+                    asyncio.create_task(tts_client.agenerate_speech(sentence, voice="alloy"))
+                    for sentence in sentences
+                ]
+
+                final_sent = False
+                try:
+                    with TimingContext("Response TTS Generation", conversation_id):
+                        for index, (sentence, tts_task) in enumerate(zip(sentences, tts_tasks)):
+                            audio_path = await tts_task
+                            if not audio_path:
+                                continue
+
+                            audio_url = public_audio_url(audio_path)
+
+                            final = index == len(sentences) - 1
+                            queue_bridge_message(outbox, writer_task, orjson.dumps({
+                                "event": "response",
+                                "audio_url": audio_url,
+                                "text": sentence,
+                                "final": final
+                            }).decode())
+                            final_sent = final
+                            logger.info("🎵 [%s] Queued response audio: %s", conversation_id, audio_url)
+                finally:
+                    # Stop waiting on synthesis for a caller that has gone away; the shielded
+                    # synthesis itself still runs to completion and lands in the cache
+                    for tts_task in tts_tasks:
+                        tts_task.cancel()
+                    # The client waits for a final frame, even when the last sentence failed TTS
+                    if not final_sent:
+                        try:
+                            queue_bridge_message(outbox, writer_task, orjson.dumps({
+                                "event": "response",
+                                "final": True
+                            }).decode())
+                        except ConnectionError:
+                            pass
                     
     except WebSocketDisconnect:
-        logger.info(f"🔌 [{conversation_id}] Transcription bridge disconnected")
+        logger.info("🔌 [%s] Transcription bridge disconnected", conversation_id)
     except Exception as e:
-        logger.error(f"❌ [{conversation_id}] Transcription bridge error: {e}")
+        logger.error("❌ [%s] Transcription bridge error: %s", conversation_id, e)
     finally:
+        writer_task.cancel()
         # Cleanup connection
-        if call_sid in active_whisper_connections:
-            del active_whisper_connections[call_sid]
+        active_whisper_connections.pop(call_sid, None)
+
+async def queue_sentence_audio(user_text: str, history, tts_queue: asyncio.Queue):
+    """Start TTS for each LLM sentence as soon as it is generated"""
+    try:
+        async for sentence in llm_client.astream_sentences(user_text, history=history):
+            await tts_queue.put((sentence, asyncio.create_task(tts_client.agenerate_speech(sentence, voice="alloy"))))
+    finally:
+        await tts_queue.put(None)
+
+@app.websocket("/ws/conversation_stream")
+async def conversation_stream(websocket: WebSocket):
+    """Stream LLM replies sentence by sentence, each with its own TTS audio"""
+    global active_conversation_streams
+
+    conversation_id = short_id()
+    token = websocket.query_params.get("token") or websocket.headers.get("authorization", "").removeprefix("Bearer ")
+    if not CONVERSATION_STREAM_TOKEN or not hmac.compare_digest(token.encode(), CONVERSATION_STREAM_TOKEN.encode()):
+        logger.warning("🚫 [%s] Conversation stream rejected: bad or missing token", conversation_id)
+        await websocket.close(code=1008)
+        return
+    if active_conversation_streams >= CONVERSATION_STREAM_MAX_CONNECTIONS:
+        logger.warning("🚫 [%s] Conversation stream rejected: %d streams active", conversation_id, active_conversation_streams)
+        await websocket.close(code=1013)
+        return
+
+    # Count the slot before any await so the cap holds, and release it in the finally below
+    active_conversation_streams += 1
+    last_turn_at = 0.0
+    # This connection's conversation so far; each reply is added once it has fully streamed
+    history = deque(maxlen=CONVERSATION_STREAM_HISTORY_MESSAGES)
+    try:
+        await websocket.accept()
+        logger.info("🔗 [%s] Conversation stream connected", conversation_id)
+
+        while True:
+            try:
+                data = orjson.loads(await websocket.receive_text())
+            except orjson.JSONDecodeError:
+                data = None
+            user_text = data.get("text") if isinstance(data, dict) else None
+            if not isinstance(user_text, str):
+                await websocket.send_text(orjson.dumps({"event": "error", "error": "expected a JSON object with a text field"}).decode())
+                continue
+            user_text = user_text.strip()
+            if not user_text:
+                continue
+            if len(user_text) > CONVERSATION_STREAM_MAX_TEXT_CHARS:
+                await websocket.send_text(orjson.dumps({"event": "error", "error": "text too long"}).decode())
+                continue
+            if time.monotonic() - last_turn_at < CONVERSATION_STREAM_MIN_TURN_INTERVAL_S:
+                await websocket.send_text(orjson.dumps({"event": "error", "error": "rate limited"}).decode())
+                continue
+            last_turn_at = time.monotonic()
+
+            # LLM generation and TTS overlap: the first sentence is playable while
+            # later ones are still being decoded
+            tts_queue = asyncio.Queue()
+            producer_task = asyncio.create_task(queue_sentence_audio(user_text, tuple(history), tts_queue))
+            reply_sentences = []
+            try:
+                with TimingContext("Streamed Response", conversation_id):
+                    while (item := await tts_queue.get()) is not None:
+                        sentence, tts_task = item
+                        reply_sentences.append(sentence)
+                        audio_path = await tts_task
+                        await websocket.send_text(orjson.dumps({
+                            "event": "response",
+                            "audio_url": public_audio_url(audio_path) if audio_path else None,
+                            "text": sentence,
+                            "final": False
+                        }).decode())
+                    await producer_task
+                if reply_sentences:
+                    history.append({"role": "user", "content": user_text})
+                    history.append({"role": "assistant", "content": " ".join(reply_sentences)})
+                await websocket.send_text(orjson.dumps({"event": "response", "final": True}).decode())
+            finally:
+                producer_task.cancel()
+                while not tts_queue.empty():
+                    item = tts_queue.get_nowait()
+                    if item is not None:
+                        item[1].cancel()
+
+    except WebSocketDisconnect:
+        logger.info("🔌 [%s] Conversation stream disconnected", conversation_id)
+    except Exception as e:
+        logger.error("❌ [%s] Conversation stream error: %s", conversation_id, e)
+    finally:
+        active_conversation_streams -= 1
 
 @app.post("/process_speech")
 async def process_speech(request: Request):
     conversation_id = get_conversation_id(request)
-    total_turn_start = time.time()
+    total_turn_start = time.perf_counter()
 
-    logger.info(f"🎤 [{conversation_id}] SPEECH PROCESSING - Webhook received")
+    logger.info("🎤 [%s] SPEECH PROCESSING - Webhook received", conversation_id)
 
     form = await request.form()
     user_text = form.get("SpeechResult", "")
-    stt_processing_time = time.time() - total_turn_start
+    stt_processing_time = time.perf_counter() - total_turn_start
 
-    logger.info(f"🗣️ [{conversation_id}] User said: '{user_text}' (STT: {stt_processing_time:.3f}s)")
+    logger.info("🗣️ [%s] User said: '%s' (STT: %.3fs)", conversation_id, user_text, stt_processing_time)
 
     # Check if user wants to end the call
-    end_call_phrases = ["goodbye", "bye", "see you", "talk to you later", "hang up", "end call", "that's all"]
-    if any(phrase in user_text.lower() for phrase in end_call_phrases):
+    if END_CALL_PATTERN.search(user_text):
         response = VoiceResponse()
 
         # Try TTS for goodbye message
-        goodbye_text = "Goodbye! It was nice talking to you."
-        audio_path = tts_client.generate_speech(goodbye_text, voice="alloy")
+        goodbye_text = GOODBYE_TEXT
+        audio_path = await tts_client.agenerate_speech(goodbye_text, voice="alloy")
 
         if audio_path:
-            audio_url = f"https://53453cec9732.ngrok-free.app/audio/{os.path.basename(audio_path)}"
+            audio_url = public_audio_url(audio_path)
             response.play(audio_url)
-            print(f"🎵 Playing goodbye TTS: {audio_url}")
+            logger.debug("🎵 Playing goodbye TTS: %s", audio_url)
         else:
             response.say(goodbye_text)
 
@@ -207,28 +468,51 @@ async def process_speech(request: Request):
 
     # Process through conversation manager
     with TimingContext("LLM Processing", conversation_id):
-        ai_response, conversation_state = conversation_manager.process_conversation_turn(phone_number, user_text, booking_system)
+        ai_response, conversation_state = await asyncio.to_thread(
+            conversation_manager.process_conversation_turn, phone_number, user_text, booking_system
+        )
 
-    llm_processing_time = time.time() - (total_turn_start + stt_processing_time)
-    logger.info(f"🤖 [{conversation_id}] AI response: '{ai_response[:100]}...' (LLM: {llm_processing_time:.3f}s)")
-    logger.info(f"📊 [{conversation_id}] Conversation state: {conversation_state}")
+    llm_processing_time = time.perf_counter() - (total_turn_start + stt_processing_time)
+    logger.info("🤖 [%s] AI response: '%.100s...' (LLM: %.3fs)", conversation_id, ai_response, llm_processing_time)
+    logger.info("📊 [%s] Conversation state: %s", conversation_id, conversation_state)
+
+    # Smart conversation continuation - adapt prompts based on context
+    if QUESTION_CUE_PATTERN.search(ai_response):
+        # If AI asked a question, be very brief
+        selected_prompt = random.choice(QUESTION_FOLLOW_UPS)
+    elif EXCITED_CUE_PATTERN.search(ai_response):
+        # If AI is excited/positive, encourage more sharing
+        selected_prompt = random.choice(EXCITED_FOLLOW_UPS)
+    elif len(ai_response.split()) > LONG_REPLY_WORDS:  # Long response
+        # After detailed response, give space
+        selected_prompt = random.choice(LONG_REPLY_FOLLOW_UPS)
+    else:
+        # Default varied prompts for natural flow
+        selected_prompt = random.choice(DEFAULT_FOLLOW_UPS)
+
+    # For "silent" listening, use a very brief, subtle TTS sound
+    prompt_text = selected_prompt or SILENT_PROMPT_TEXT
+
+    # Response and listening prompt are independent, so synthesize them together
+    # (consistent voice throughout)
+    with TimingContext("Response + Prompt TTS Generation", conversation_id):
+        audio_path, prompt_audio_path = await asyncio.gather(
+            tts_client.agenerate_speech(ai_response, voice="alloy"),
+            tts_client.agenerate_speech(prompt_text, voice="alloy")
+        )
 
     # Continue the conversation by gathering more speech
     response = VoiceResponse()
 
-    # Try to generate TTS audio, fallback to text-to-speech if it fails
-    with TimingContext("Response TTS Generation", conversation_id):
-        audio_path = tts_client.generate_speech(ai_response, voice="alloy")
-
     if audio_path:
         # Use TTS audio with Play verb
-        audio_url = f"https://53453cec9732.ngrok-free.app/audio/{os.path.basename(audio_path)}"
+        audio_url = public_audio_url(audio_path)
         response.play(audio_url)
-        print(f"🎵 Playing TTS audio: {audio_url}")
+        logger.debug("🎵 Playing TTS audio: %s", audio_url)
     else:
         # Fallback to Twilio's text-to-speech
         response.say(ai_response)
-        print("⚠️ TTS failed, using fallback text-to-speech")
+        logger.warning("⚠️ TTS failed, using fallback text-to-speech")
 
     # Add another gather to continue the conversation with varied prompts
     gather = Gather(
@@ -238,62 +522,18 @@ async def process_speech(request: Request):
         speech_timeout="auto"
     )
 
-    # Smart conversation continuation - adapt prompts based on context
-    import random
-
-    # Analyze the AI response to determine appropriate follow-up
-    ai_lower = ai_response.lower()
-
-    # Different prompt strategies based on response type
-    if any(word in ai_lower for word in ["?", "what", "how", "tell me"]):
-        # If AI asked a question, be very brief
-        prompts = ["", "Go ahead", "I'm listening"]
-        selected_prompt = random.choice(prompts + [""] * 4)  # Mostly silent
-    elif any(word in ai_lower for word in ["!", "great", "wonderful", "amazing"]):
-        # If AI is excited/positive, encourage more sharing
-        prompts = ["Tell me more", "What else?", "Go on"]
-        selected_prompt = random.choice(prompts)
-    elif len(ai_response.split()) > 30:  # Long response
-        # After detailed response, give space
-        prompts = ["", "What do you think?", "Any questions?"]
-        selected_prompt = random.choice(prompts + [""] * 3)
-    else:
-        # Default varied prompts for natural flow
-        prompts = [
-            "Go ahead",
-            "I'm listening",
-            "What would you like to know?",
-            "Yes?",
-            "Tell me more"
-        ]
-        selected_prompt = random.choice(prompts)
-
-    # Use TTS for listening prompts too - consistent voice throughout
-    if selected_prompt:
-        with TimingContext("Prompt TTS Generation", conversation_id):
-            prompt_audio_path = tts_client.generate_speech(selected_prompt, voice="alloy")
-        if prompt_audio_path:
-            prompt_audio_url = f"https://53453cec9732.ngrok-free.app/audio/{os.path.basename(prompt_audio_path)}"
-            gather.play(prompt_audio_url)
-            print(f"🎵 Playing prompt TTS: {prompt_audio_url}")
-        else:
-            # Fallback if TTS fails
-            gather.say(selected_prompt)
+    if prompt_audio_path:
+        prompt_audio_url = public_audio_url(prompt_audio_path)
+        gather.play(prompt_audio_url)
+        logger.debug("🎵 Playing prompt TTS: %s", prompt_audio_url)
     else:
-        # For "silent" listening, use a very brief, subtle TTS sound
-        with TimingContext("Silent Prompt TTS Generation", conversation_id):
-            silent_audio_path = tts_client.generate_speech("...", voice="alloy")
-        if silent_audio_path:
-            silent_audio_url = f"https://53453cec9732.ngrok-free.app/audio/{os.path.basename(silent_audio_path)}"
-            gather.play(silent_audio_url)
-        else:
-            # Ultimate fallback
-            gather.say("...")
+        # Fallback if TTS fails
+        gather.say(prompt_text)
 
     response.append(gather)
 
-    total_turn_duration = time.time() - total_turn_start
-    logger.info(f"🏁 [{conversation_id}] TOTAL TURN: {total_turn_duration:.3f}s")
+    total_turn_duration = time.perf_counter() - total_turn_start
+    logger.info("🏁 [%s] TOTAL TURN: %.3fs", conversation_id, total_turn_duration)
 
     return Response(content=str(response), media_type="text/xml")
 
@@ -305,7 +545,7 @@ async def test_endpoint(request: Request):
 async def cleanup_audio():
     """Clean up old audio files"""
     try:
-        tts_client.cleanup_old_files()
+        await asyncio.to_thread(tts_client.cleanup_old_files)
         return {"message": "Audio cleanup completed"}
     except Exception as e:
         return {"error": f"Cleanup failed: {str(e)}"}
@@ -315,22 +555,23 @@ async def cleanup_audio():
 async def send_reminder(request: Request):
     """Send reminder for a booking"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
         booking_id = data.get('booking_id')
         hours_before = data.get('hours_before', 24)
 
         if not booking_id:
             return {"error": "Booking ID required"}
 
-        # Get booking details
-        booking_result = booking_system.supabase_client.get_booking(booking_id)
+        # Get booking details (blocking Supabase call runs off the event loop)
+        booking_result = await asyncio.to_thread(booking_system.supabase_client.get_booking, booking_id)
         if not booking_result:
             return {"error": "Booking not found"}
 
         # Send reminder
-        from restaurant.notifications import RestaurantNotificationService
-        notification_service = RestaurantNotificationService()
-        result = notification_service.send_booking_reminder(booking_result, hours_before)
+        from restaurant.notifications import get_notification_service
+        notification_service = get_notification_service()
+        # SMTP and Twilio calls are blocking; run them off the event loop
+        result = await asyncio.to_thread(notification_service.send_booking_reminder, booking_result, hours_before)
 
         return {
             "success": result['email_sent'] or result['sms_sent'],
@@ -340,37 +581,51 @@ async def send_reminder(request: Request):
         }
 
     except Exception as e:
-        print(f"Send reminder API error: {e}")
+        logger.error("❌ Send reminder API error: %s", e)
         return {"error": str(e)}
 
 # Dashboard API Endpoints
+# Serializes bookings fetches so concurrent dashboard/analytics polls share one Supabase scan
+BOOKINGS_FETCH_LOCK = asyncio.Lock()
+
+async def fetch_all_bookings():
+    """Get all bookings, letting concurrent misses wait for one fetch and reuse its cached result"""
+    async with BOOKINGS_FETCH_LOCK:
+        # Blocking Supabase call runs off the event loop; get_all_bookings caches briefly
+        return await asyncio.to_thread(booking_system.supabase_client.get_all_bookings)
+
 @app.get("/api/dashboard")
 async def get_dashboard_data():
     """Get dashboard overview data"""
     try:
-        # Get all bookings from Supabase
-        result = booking_system.supabase_client.get_all_bookings()
+        result = await fetch_all_bookings()
 
         if not result.get('success', False):
             return {"error": "Failed to fetch bookings"}
 
         bookings = result.get('data', [])
 
-        # Calculate stats
+        # Calculate stats in a single pass over the bookings
+        today = date.today().isoformat()
         total_bookings = len(bookings)
-        total_guests = sum(booking.get('party_size', 0) for booking in bookings)
+        total_guests = 0
+        today_bookings = 0
+        confirmed = []
+        for booking in bookings:
+            total_guests += booking.get('party_size', 0)
+            if booking.get('status') == 'confirmed':
+                confirmed.append(booking)
+                if booking.get('date') == today:
+                    today_bookings += 1
         avg_party_size = total_guests / total_bookings if total_bookings > 0 else 0
 
-        # Today's bookings
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_bookings = len([b for b in bookings if b.get('date') == today and b.get('status') == 'confirmed'])
-
-        # Recent bookings (last 10, sorted by date/time)
-        recent_bookings = sorted(
-            [b for b in bookings if b.get('status') == 'confirmed'],
-            key=lambda x: f"{x.get('date')} {x.get('time')}",
-            reverse=True
-        )[:10]
+        # Recent bookings (last 10 by date/time) - bounded heap instead of sorting the full list,
+        # keyed on a (date, time) tuple instead of formatting a string per booking
+        recent_bookings = heapq.nlargest(
+            10,
+            confirmed,
+            key=lambda x: (x.get('date') or '', x.get('time') or '')
+        )
 
         return {
             "stats": {
@@ -384,112 +639,122 @@ async def get_dashboard_data():
         }
 
     except Exception as e:
-        print(f"Dashboard API error: {e}")
+        logger.error("❌ Dashboard API error: %s", e)
         return {"error": str(e)}
 
+# Time slots charted by the analytics view, with a slot -> position index for O(1) bucketing
+ANALYTICS_TIME_SLOTS = ['17:00', '18:00', '19:00', '20:00', '21:00', '22:00']
+ANALYTICS_TIME_SLOT_INDEX = {slot: idx for idx, slot in enumerate(ANALYTICS_TIME_SLOTS)}
+
 @app.get("/api/analytics")
 async def get_analytics_data():
     """Get analytics data for charts"""
     try:
-        result = booking_system.supabase_client.get_all_bookings()
+        result = await fetch_all_bookings()
 
         if not result.get('success', False):
             return {"error": "Failed to fetch bookings"}
 
         bookings = result.get('data', [])
 
-        # Bookings by day of week
+        # Bookings by day of week and by time slot, counted in one pass
         dow_counts = [0] * 7  # Mon-Sun
+        time_counts = [0] * len(ANALYTICS_TIME_SLOTS)
+
         for booking in bookings:
-            if booking.get('date') and booking.get('status') == 'confirmed':
+            if booking.get('status') != 'confirmed':
+                continue
+            booking_date = booking.get('date')
+            if booking_date:
                 try:
-                    date_obj = datetime.strptime(booking['date'], '%Y-%m-%d')
-                    dow_counts[date_obj.weekday()] += 1
-                except:
+                    # ISO dates parse in C, far cheaper than strptime
+                    dow_counts[date.fromisoformat(booking_date).weekday()] += 1
+                except (TypeError, ValueError):
                     pass
-
-        # Bookings by time slot
-        time_slots = ['17:00', '18:00', '19:00', '20:00', '21:00', '22:00']
-        time_counts = [0] * len(time_slots)
-
-        for booking in bookings:
-            if booking.get('time') and booking.get('status') == 'confirmed':
-                booking_time = booking['time'][:5]  # Take HH:MM part
-                if booking_time in time_slots:
-                    idx = time_slots.index(booking_time)
+            booking_time = booking.get('time')
+            if booking_time:
+                idx = ANALYTICS_TIME_SLOT_INDEX.get(booking_time[:5])  # Take HH:MM part
+                if idx is not None:
                     time_counts[idx] += 1
 
         return {
             "bookings_by_dow": dow_counts,
             "bookings_by_time": time_counts,
-            "time_slots": time_slots
+            "time_slots": ANALYTICS_TIME_SLOTS
         }
 
     except Exception as e:
-        print(f"Analytics API error: {e}")
+        logger.error("❌ Analytics API error: %s", e)
         return {"error": str(e)}
 
+def send_update_notifications(booking, change_type):
+    """Email and text the guest about a changed booking"""
+    try:
+        from restaurant.notifications import get_notification_service
+        notification_result = get_notification_service().send_booking_update(booking, change_type)
+        logger.info("📧 Update notifications sent: Email=%s, SMS=%s", notification_result['email_sent'], notification_result['sms_sent'])
+    except Exception as e:
+        logger.warning("⚠️ Update notification error: %s", e)
+
 @app.put("/api/bookings")
-async def update_booking(request: Request):
+async def update_booking(request: Request, background_tasks: BackgroundTasks):
     """Update a booking"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
         booking_id = data.get('id')
 
         if not booking_id:
             return {"error": "Booking ID required"}
 
         # Get original booking before update
-        original_booking = booking_system.supabase_client.get_booking(booking_id)
+        original_booking = await asyncio.to_thread(booking_system.supabase_client.get_booking, booking_id)
 
         # Update booking in Supabase
-        result = booking_system.supabase_client.update_booking(booking_id, data)
+        updated = await asyncio.to_thread(booking_system.supabase_client.update_booking, booking_id, data)
 
-        if result.get('success'):
+        if updated:
             # Send update notifications if status changed or important details changed
-            try:
-                from restaurant.notifications import RestaurantNotificationService
-                notification_service = RestaurantNotificationService()
-
-                change_type = 'modified'
-                if data.get('status') == 'cancelled':
-                    change_type = 'cancelled'
-                elif original_booking and original_booking.get('status') != data.get('status'):
-                    change_type = f"status changed to {data.get('status')}"
-
-                updated_booking = {**original_booking, **data} if original_booking else data
-                notification_result = notification_service.send_booking_update(updated_booking, change_type)
-
-                print(f"📧 Update notifications sent: Email={notification_result['email_sent']}, SMS={notification_result['sms_sent']}")
+            change_type = 'modified'
+            if data.get('status') == 'cancelled':
+                change_type = 'cancelled'
+            elif original_booking and original_booking.get('status') != data.get('status'):
+                change_type = f"status changed to {data.get('status')}"
 
-            except Exception as e:
-                print(f"⚠️ Update notification error: {e}")
+            updated_booking = {**original_booking, **data} if original_booking else data
+            # Email/SMS go out after the response so the dashboard isn't held on SMTP and Twilio
+            background_tasks.add_task(send_update_notifications, updated_booking, change_type)
 
             return {"success": True, "message": "Booking updated"}
         else:
-            return {"error": result.get('message', 'Update failed')}
+            return {"error": "Update failed"}
 
     except Exception as e:
-        print(f"Update booking API error: {e}")
+        logger.error("❌ Update booking API error: %s", e)
         return {"error": str(e)}
 
 @app.delete("/api/bookings/{booking_id}")
 async def cancel_booking(booking_id: str):
     """Cancel a booking"""
     try:
-        result = booking_system.supabase_client.cancel_booking(booking_id)
+        cancelled = await asyncio.to_thread(booking_system.supabase_client.cancel_booking, booking_id)
 
-        if result.get('success'):
+        if cancelled:
             return {"success": True, "message": "Booking cancelled"}
         else:
-            return {"error": result.get('message', 'Cancellation failed')}
+            return {"error": "Cancellation failed"}
 
     except Exception as e:
-        print(f"Cancel booking API error: {e}")
+        logger.error("❌ Cancel booking API error: %s", e)
         return {"error": str(e)}
 
 # Serve dashboard
 @app.get("/dashboard")
-async def dashboard():
+async def dashboard(request: Request):
     """Serve the restaurant dashboard"""
-    return FileResponse("restaurant/dashboard.html", media_type="text/html")
+    if DASHBOARD_HTML is None:
+        return HTMLResponse(content=DASHBOARD_FALLBACK_HTML, status_code=404)
+    if request.headers.get("if-none-match") == DASHBOARD_ETAG:
+        return Response(status_code=304, headers=DASHBOARD_CACHE_HEADERS)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return HTMLResponse(content=DASHBOARD_HTML_GZ, headers=DASHBOARD_GZIP_HEADERS)
+    return HTMLResponse(content=DASHBOARD_HTML, headers=DASHBOARD_CACHE_HEADERS)
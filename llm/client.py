@@ -1,15 +1,31 @@
 import requests
+import httpx
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterable
 import os
+import re
 import time
 import logging
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 
 logger = logging.getLogger("concya.llm")
 
 load_dotenv()
 
+# Use restaurant-specific prompt for restaurant reservations
+try:
+    from restaurant.prompts import RESTAURANT_SYSTEM_PROMPT as SYSTEM_PROMPT
+except ImportError:
+    # Fallback to general prompt if restaurant module not available
+    SYSTEM_PROMPT = "You are Concya, a helpful AI voice assistant. Keep your responses conversational, friendly, and concise since this will be spoken aloud. You're currently having a phone conversation with a user."
+
+# Built once and shared read-only by every request, keeping the prompt prefix byte-identical
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Whitespace following sentence-ending punctuation
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
 class ConcyaLLMClient:
     """Client for Concya's LLM service running on RunPod"""
 
@@ -17,6 +33,13 @@ class ConcyaLLMClient:
         load_dotenv()  # Make sure to load env vars
         self.base_url = os.getenv("RUNPOD_URL", "https://xf5aku7r0ssi19-8000.proxy.runpod.net")
         self.api_key = os.getenv("OPENAI_API_KEY")
+        # Long-lived pooled HTTP/2 client so streamed completions reuse TLS connections
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            http2=True,
+            timeout=30.0
+        )
+        self.async_client = AsyncOpenAI(api_key=self.api_key, http_client=self.http_client)
 
     def generate_response(self, user_message: str, context: Optional[str] = None) -> str:
         """
@@ -32,22 +55,9 @@ class ConcyaLLMClient:
         try:
             # First try RunPod service
             try:
-                # Use restaurant-specific prompt for restaurant reservations
-                try:
-                    from restaurant.prompts import RESTAURANT_SYSTEM_PROMPT
-                    system_prompt = RESTAURANT_SYSTEM_PROMPT
-                except ImportError:
-                    # Fallback to general prompt if restaurant module not available
-                    system_prompt = "You are Concya, a helpful AI voice assistant. Keep your responses conversational, friendly, and concise since this will be spoken aloud. You're currently having a phone conversation with a user."
-
                 payload = {
                     "model": "gpt-4o-mini",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        }
-                    ],
+                    "messages": [SYSTEM_MSG],
                     "max_tokens": 150,
                     "temperature": 0.7
                 }
@@ -68,39 +78,29 @@ class ConcyaLLMClient:
                     "Content-Type": "application/json"
                 }
 
-                start_time = time.time()
+                start_time = time.perf_counter()
                 response = requests.post(
                     f"{self.base_url}/v1/chat/completions",
                     json=payload,
                     headers=headers,
                     timeout=5  # Shorter timeout
                 )
-                runpod_duration = time.time() - start_time
-                logger.info(f"🔗 RunPod API call: {runpod_duration:.3f}s")
+                runpod_duration = time.perf_counter() - start_time
+                logger.info("🔗 RunPod API call: %.3fs", runpod_duration)
 
                 if response.status_code == 200:
                     result = response.json()
+                    self._log_prompt_cache_usage(result.get("usage"))
                     return result["choices"][0]["message"]["content"].strip()
 
             except (requests.RequestException, KeyError, json.JSONDecodeError):
                 print("⚠️  RunPod service unavailable, falling back to direct OpenAI API")
 
             # Fallback to direct OpenAI API
-            # Use restaurant-specific prompt for restaurant reservations
-            try:
-                from restaurant.prompts import RESTAURANT_SYSTEM_PROMPT
-                system_prompt = RESTAURANT_SYSTEM_PROMPT
-            except ImportError:
-                # Fallback to general prompt if restaurant module not available
-                system_prompt = "You are Concya, a helpful AI voice assistant. Keep your responses conversational, friendly, and concise since this will be spoken aloud. You're currently having a phone conversation with a user."
-
             openai_payload = {
                 "model": "gpt-4o-mini",
                 "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
+                    SYSTEM_MSG,
                     {
                         "role": "user",
                         "content": user_message
@@ -115,18 +115,19 @@ class ConcyaLLMClient:
                 "Content-Type": "application/json"
             }
 
-            openai_start_time = time.time()
+            openai_start_time = time.perf_counter()
             openai_response = requests.post(
                 "https://api.openai.com/v1/chat/completions",
                 json=openai_payload,
                 headers=openai_headers,
                 timeout=10
             )
-            openai_duration = time.time() - openai_start_time
-            logger.info(f"🔗 OpenAI API call: {openai_duration:.3f}s")
+            openai_duration = time.perf_counter() - openai_start_time
+            logger.info("🔗 OpenAI API call: %.3fs", openai_duration)
 
             openai_response.raise_for_status()
             openai_result = openai_response.json()
+            self._log_prompt_cache_usage(openai_result.get("usage"))
             return openai_result["choices"][0]["message"]["content"].strip()
 
         except requests.RequestException as e:
@@ -137,6 +138,101 @@ class ConcyaLLMClient:
             print(f"❌ LLM Response Parsing Error: {e}")
             return "I got a response but couldn't understand it. Let's try again."
 
+    def _log_prompt_cache_usage(self, usage: Optional[Dict[str, Any]]):
+        """Log how many prompt tokens were served from OpenAI's prompt cache"""
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        if prompt_tokens:
+            logger.info("🧠 Prompt cache: %d/%d tokens cached (%.0f%%)", cached_tokens, prompt_tokens, 100 * cached_tokens / prompt_tokens)
+
+    async def astream_response(self, user_message: str, context: Optional[str] = None,
+                               history: Iterable[Dict[str, str]] = ()) -> AsyncIterator[str]:
+        """
+        Stream a response from OpenAI as text deltas
+
+        Lets callers start speaking the first sentence while the rest of the
+        completion is still being generated.
+
+        Args:
+            user_message: The user's input message
+            context: Optional conversation context
+            history: Earlier user/assistant messages of this conversation, oldest first
+
+        Yields:
+            Text deltas in generation order
+        """
+        messages = [SYSTEM_MSG]
+        if context:
+            messages.append({"role": "system", "content": f"Context: {context}"})
+        messages.extend(history)
+        messages.append({"role": "user", "content": user_message})
+
+        start_time = time.perf_counter()
+        first_token_time = None
+
+        stream = await self.async_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            max_tokens=150,
+            temperature=0.7,
+            stream=True,
+            # Ask for a final usage chunk so cached prompt tokens are visible on the live path.
+            # Sent as extra_body because the pinned SDK predates the stream_options argument.
+            extra_body={"stream_options": {"include_usage": True}}
+        )
+
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            if usage:
+                self._log_prompt_cache_usage(usage if isinstance(usage, dict) else usage.model_dump())
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token_time is None:
+                first_token_time = time.perf_counter()
+                logger.info("⚡ OpenAI stream TTFT: %.3fs", first_token_time - start_time)
+            yield delta
+
+        logger.info("🔗 OpenAI stream complete: %.3fs", time.perf_counter() - start_time)
+
+    async def astream_sentences(self, user_message: str, context: Optional[str] = None,
+                                history: Iterable[Dict[str, str]] = ()) -> AsyncIterator[str]:
+        """
+        Stream a response from OpenAI as complete sentences
+
+        Each sentence is yielded as soon as its boundary arrives, so TTS for the
+        first sentence can start while the model is still generating the rest.
+
+        Args:
+            user_message: The user's input message
+            context: Optional conversation context
+            history: Earlier user/assistant messages of this conversation, oldest first
+
+        Yields:
+            Sentences in generation order
+        """
+        buffer = ""
+        async for delta in self.astream_response(user_message, context, history):
+            buffer += delta
+            # Most deltas are mid-sentence words: only look at the new text, and only
+            # re-split the buffer when it completed a sentence boundary
+            if not SENTENCE_BOUNDARY.search(buffer, len(buffer) - len(delta)):
+                continue
+            *sentences, buffer = SENTENCE_BOUNDARY.split(buffer)
+            for sentence in sentences:
+                if sentence.strip():
+                    yield sentence.strip()
+
+        if buffer.strip():
+            yield buffer.strip()
+
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self.http_client.aclose()
+
     def health_check(self) -> bool:
         """Check if the LLM service is healthy"""
         try:
@@ -5,16 +5,21 @@ Manages reservations, availability, and booking workflow using Supabase
 
 import json
 import os
-from datetime import datetime, time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timezone
 from typing import Dict, List, Optional, Any
 from pathlib import Path
-from .supabase_client import SupabaseRestaurantClient
+from .supabase_client import get_supabase_client, MAX_SLOT_CAPACITY
+
+# Email/SMS delivery takes seconds, so it runs off the caller's reply path
+NOTIFICATION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="booking-notify")
 
 class RestaurantBookingSystem:
     """Manages restaurant reservations and availability using Supabase"""
 
     def __init__(self):
-        self.supabase_client = SupabaseRestaurantClient()
+        self.supabase_client = get_supabase_client()
         self.supabase_client.initialize_tables()
 
         # Restaurant operating hours
@@ -27,6 +32,11 @@ class RestaurantBookingSystem:
             'saturday': {'open': '17:00', 'close': '23:00'},
             'sunday': {'open': '16:00', 'close': '21:00'}
         }
+        # Parsed once so validation compares time objects instead of re-parsing the hours
+        self.hours_parsed = {
+            day: (time.fromisoformat(hours['open']), time.fromisoformat(hours['close']))
+            for day, hours in self.hours.items()
+        }
 
 
     def check_availability(self, date: str, time_slot: str, party_size: int) -> Dict[str, Any]:
@@ -68,12 +78,14 @@ class RestaurantBookingSystem:
 
     def _find_alternatives(self, date: str, party_size: int) -> str:
         """Find alternative time slots"""
-        alternatives = []
         common_times = ['18:00', '19:00', '20:00', '21:00']
 
-        for time_slot in common_times:
-            if self.check_availability(date, time_slot, party_size)['available']:
-                alternatives.append(f"{time_slot}")
+        # One query for every candidate slot instead of a full availability check per slot
+        capacity = self.supabase_client.get_capacity_by_slot(date, common_times) or {}
+        alternatives = [
+            time_slot for time_slot in common_times
+            if time_slot in capacity and party_size <= MAX_SLOT_CAPACITY - capacity[time_slot]
+        ]
 
         if alternatives:
             return f"Available alternatives: {', '.join(alternatives[:3])}"
@@ -113,8 +125,9 @@ class RestaurantBookingSystem:
                     'message': availability['message']
                 }
 
-            # Create booking data for Supabase
-            booking_id = f"{booking_data['date']}_{booking_data['time']}_{booking_data['guest_name'].replace(' ', '_')}"
+            # Create booking data for Supabase - random suffix keeps ids unique when the
+            # same guest books the same slot twice or two workers insert concurrently
+            booking_id = f"{booking_data['date']}_{booking_data['time']}_{booking_data['guest_name'].replace(' ', '_')}_{uuid.uuid4().hex[:8]}"
 
             supabase_booking = {
                 'id': booking_id,
@@ -125,7 +138,7 @@ class RestaurantBookingSystem:
                 'phone': booking_data['phone'],
                 'special_requests': booking_data.get('special_requests', ''),
                 'status': 'confirmed',
-                'created_at': datetime.now().isoformat(),
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
                 'notifications_sent': False
             }
 
@@ -133,20 +146,8 @@ class RestaurantBookingSystem:
             result = self.supabase_client.create_booking(supabase_booking)
 
             if result['success']:
-                # Send confirmation notifications (email + SMS)
-                try:
-                    from .notifications import RestaurantNotificationService
-                    notification_service = RestaurantNotificationService()
-                    notification_result = notification_service.send_booking_confirmation(supabase_booking)
-
-                    # Update booking to mark notifications as sent
-                    if notification_result['email_sent'] or notification_result['sms_sent']:
-                        self.supabase_client.update_booking(booking_id, {'notifications_sent': True})
-
-                    print(f"📧 Notifications sent: Email={notification_result['email_sent']}, SMS={notification_result['sms_sent']}")
-
-                except Exception as e:
-                    print(f"⚠️ Notification error: {e}")
+                # Send confirmation notifications (email + SMS) in the background
+                NOTIFICATION_EXECUTOR.submit(self._send_confirmation_notifications, supabase_booking)
 
                 return {
                     'success': True,
@@ -160,6 +161,22 @@ class RestaurantBookingSystem:
                     'message': "I'm having trouble saving your reservation right now. Please try again."
                 }
 
+    def _send_confirmation_notifications(self, booking: Dict[str, Any]):
+        """Send booking confirmation email + SMS and record that they went out"""
+        try:
+            from .notifications import get_notification_service
+            notification_service = get_notification_service()
+            notification_result = notification_service.send_booking_confirmation(booking)
+
+            # Update booking to mark notifications as sent
+            if notification_result['email_sent'] or notification_result['sms_sent']:
+                self.supabase_client.update_booking(booking['id'], {'notifications_sent': True})
+
+            print(f"📧 Notifications sent: Email={notification_result['email_sent']}, SMS={notification_result['sms_sent']}")
+
+        except Exception as e:
+            print(f"⚠️ Notification error: {e}")
+
     def get_booking(self, booking_id: str) -> Optional[Dict]:
         """Get booking details by ID using Supabase"""
         return self.supabase_client.get_booking(booking_id)
@@ -180,8 +197,7 @@ class RestaurantBookingSystem:
 
             # Parse time
             booking_time = datetime.strptime(time_slot, '%H:%M').time()
-            open_time = datetime.strptime(self.hours[day_name]['open'], '%H:%M').time()
-            close_time = datetime.strptime(self.hours[day_name]['close'], '%H:%M').time()
+            open_time, close_time = self.hours_parsed[day_name]
 
             if booking_time < open_time or booking_time > close_time:
                 return {
@@ -3,15 +3,234 @@ Conversation State Manager for Restaurant Booking
 Manages conversation flow and remembers booking information
 """
 
+import os
 import re
+import json
 import time
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
+try:
+    import redis
+except ImportError:
+    # Redis is optional - without it conversations stay in process memory
+    redis = None
+
 logger = logging.getLogger("concya.conversation")
 
+# Fields that must be filled before a booking can be confirmed
+REQUIRED_FIELDS = ('party_size', 'date', 'time', 'guest_name')
+
+# Month name to month number, shared by every date pattern
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+# Meridiem markers captured by the time patterns (text is already lower-cased)
+PM_MARKERS = frozenset({'pm', 'p.m'})
+AM_MARKERS = frozenset({'am', 'a.m'})
+
+# Relative day words, resolved to an offset from today by the name of the group that matched
+RELATIVE_DATE_PATTERN = re.compile(r'(?P<tomorrow>tomorrow)|(?P<today>today|tonight)')
+RELATIVE_DAY_OFFSETS = {'today': 0, 'tomorrow': 1}
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+# Weekday names, optionally "next friday"
+WEEKDAY_PATTERN = re.compile(r'(?P<next>next\s+)?\b(?P<weekday>' + '|'.join(WEEKDAYS) + r')\b')
+
+# Explicit dates ("15th october", "october 15", "2025-10-15") and times ("7pm", "at 7:30 p.m",
+# "7 o'clock", "at 7") share one pattern so the text is scanned once; the outer group names the
+# kind of match. A bare number needs "at" so party sizes aren't read as times.
+_MONTH_NAME = '|'.join(MONTHS)
+DATE_TIME_PATTERN = re.compile(
+    r'(?P<date>(?P<day_first>\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<month_after>' + _MONTH_NAME + r')'
+    r'|(?P<month_first>' + _MONTH_NAME + r')\s+(?P<day_after>\d{1,2})(?:st|nd|rd|th)?'
+    r'|(?P<iso>\d{4}-\d{2}-\d{2}))'
+    r"|(?P<time>(?:\bat\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?:(?P<meridiem>am|pm|a\.m|p\.m)|o'?clock)"
+    r"|\bat\s+(?P<at_hour>\d{1,2})(?::(?P<at_minute>\d{2}))?(?!\d|(?:st|nd|rd|th)?\s+(?:of\s+)?(?:" + _MONTH_NAME + r")))"
+)
+# Time phrasings in priority order: "7pm" beats "7 o'clock" beats a bare "at 7", wherever each
+# appears in the text, and the first phrasing that gives a valid time wins
+TIME_KINDS = ('meridiem', 'oclock', 'at')
+
+# Special request keywords, reported in this order; one alternation finds them all in a single scan
+SPECIAL_KEYWORDS = (
+    'window', 'outside', 'patio', 'indoor', 'quiet', 'romantic',
+    'birthday', 'anniversary', 'celebration', 'vegan', 'vegetarian',
+    'gluten free', 'allergic', 'wheelchair', 'accessible'
+)
+SPECIAL_REQUEST_PATTERN = re.compile('|'.join(keyword.replace(' ', '[ -]') for keyword in SPECIAL_KEYWORDS))
+
+# Confirmation / change cues, matched as substrings of the lower-cased utterance in one scan each
+CONFIRMATION_PATTERN = re.compile('yes|confirm|correct|right|perfect|okay|sure|book it')
+CHANGE_REQUEST_PATTERN = re.compile('change|different|modify|update|wrong|instead|rather')
+
+# Common guest name phrasings, compiled once and tried in priority order
+_NAME = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
+NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:my name is|i\'?m|this is)\s+' + _NAME,
+    r'for\s+' + _NAME,
+    r'under\s+' + _NAME,
+    _NAME + r'\s+(?:party|reservation)'
+))
+
+# Word to number mapping for common numbers
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19, 'twenty': 20
+}
+
+# Party size phrasings in priority order: every digit form before any number-word form,
+# and within each, the first phrasing that matches wins (not the leftmost match in the text)
+_PARTY_WORD = '(' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + ')'  # longest first: 'seventeen' before 'seven'
+_PARTY_NOUN = r'(?:people|guests?|party|persons?)'
+PARTY_SIZE_PATTERNS = tuple(re.compile(pattern) for number in (r'(\d+)', _PARTY_WORD) for pattern in (
+    number + r'\s*' + _PARTY_NOUN,
+    r'table\s+for\s+' + number,
+    r'party\s+of\s+' + number,
+    r'reservation\s+for\s+' + number,
+    r'for\s+' + number + r'\s*' + _PARTY_NOUN
+))
+
+# Anything the parser can extract needs a digit or one of these words; small talk has none
+BOOKING_TRIGGER_PATTERN = re.compile(
+    r'\d|' + '|'.join((*NUMBER_WORDS, *MONTHS, *WEEKDAYS, 'today', 'tomorrow', 'tonight'))
+    + '|' + SPECIAL_REQUEST_PATTERN.pattern
+)
+
+def _time_kind(match: re.Match) -> str:
+    """Classify a DATE_TIME_PATTERN time match by its TIME_KINDS phrasing"""
+    if match.group('meridiem'):
+        return 'meridiem'
+    return 'oclock' if match.group('hour') else 'at'
+
+def _time_from_match(match: re.Match) -> Optional[str]:
+    """Convert a DATE_TIME_PATTERN time match to HH:MM, or None if it is out of range"""
+    hour = int(match.group('hour') or match.group('at_hour'))
+    minute = match.group('minute') or match.group('at_minute')
+    minute = int(minute) if minute else 0
+    am_pm = match.group('meridiem')
+
+    if am_pm:
+        if am_pm in PM_MARKERS and hour != 12:
+            hour += 12
+        elif am_pm in AM_MARKERS and hour == 12:
+            hour = 0
+
+    if hour > 23 or minute > 59:
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+@lru_cache(maxsize=1024)
+def _parse_booking_text(user_lower: str, today_ordinal: int) -> Dict[str, Any]:
+    """Parse lower-cased booking text; cached per day since relative dates depend on today"""
+    parsed_info = {
+        'party_size': None,
+        'date': None,
+        'time': None,
+        'special_requests': None
+    }
+
+    # Fast path for small talk ("hello", "yes please", names)
+    if not BOOKING_TRIGGER_PATTERN.search(user_lower):
+        return parsed_info
+
+    # Parse party size - be more specific to avoid confusion with times
+    for pattern in PARTY_SIZE_PATTERNS:
+        match = pattern.search(user_lower)
+        if not match:
+            continue
+        value = match.group(1)
+        party_size = int(value) if value.isdigit() else NUMBER_WORDS[value]
+        # Only accept reasonable party sizes (1-20)
+        if 1 <= party_size <= 20:
+            parsed_info['party_size'] = party_size
+            break
+
+    # Parse date
+    today = date.fromordinal(today_ordinal)
+
+    # Check for relative dates first; "tomorrow" wins over "today"/"tonight" when both appear
+    offsets = [RELATIVE_DAY_OFFSETS[match.lastgroup] for match in RELATIVE_DATE_PATTERN.finditer(user_lower)]
+    if offsets:
+        parsed_info['date'] = (today + timedelta(days=max(offsets))).isoformat()
+
+    # Then scan once for explicit dates and times, keeping the first time of each phrasing
+    match = None
+    time_matches = {}
+    for date_time in DATE_TIME_PATTERN.finditer(user_lower):
+        if date_time.lastgroup == 'date':
+            match = match or date_time
+        else:
+            time_matches.setdefault(_time_kind(date_time), date_time)
+        if match and 'meridiem' in time_matches:
+            break
+
+    for kind in TIME_KINDS:
+        if kind in time_matches:
+            parsed_info['time'] = _time_from_match(time_matches[kind])
+            if parsed_info['time']:
+                break
+
+    # Explicit dates win over relative ones, falling back to weekday names
+    parsed_date = None
+    try:
+        if match and match.group('iso'):
+            parsed_date = date.fromisoformat(match.group('iso'))
+        elif match:
+            month = MONTHS[match.group('month_after') or match.group('month_first')]
+            day = int(match.group('day_first') or match.group('day_after'))
+            parsed_date = date(today.year, month, day)
+            if parsed_date < today:
+                parsed_date = date(today.year + 1, month, day)
+        else:
+            match = WEEKDAY_PATTERN.search(user_lower)
+            if match:
+                # "friday" is the coming friday (today included), "next friday" is never today
+                days_ahead = (WEEKDAYS[match.group('weekday')] - today.weekday()) % 7
+                if match.group('next') and days_ahead == 0:
+                    days_ahead = 7
+                parsed_date = today + timedelta(days=days_ahead)
+    except ValueError:
+        parsed_date = None
+
+    if parsed_date:
+        parsed_info['date'] = parsed_date.isoformat()
+
+    # Parse special requests
+    found = {match.group().replace('-', ' ') for match in SPECIAL_REQUEST_PATTERN.finditer(user_lower)}
+    special_parts = [keyword for keyword in SPECIAL_KEYWORDS if keyword in found]
+
+    if special_parts:
+        parsed_info['special_requests'] = ', '.join(special_parts)
+
+    return parsed_info
+
+
+@lru_cache(maxsize=1024)
+def _extract_name(user_text: str) -> Optional[str]:
+    """Match the name patterns in priority order; cached since callers repeat the same phrases"""
+    for pattern in NAME_PATTERNS:
+        match = pattern.search(user_text)
+        if match:
+            # Collapse the whitespace runs the pattern allows between words
+            name = " ".join(match.group(1).split())
+            # Basic validation - should be 2-50 chars (the pattern only captures letters)
+            if 2 <= len(name) <= 50:
+                return name.title()
+
+    return None
+
+
 class BookingState(Enum):
     """States of the booking conversation"""
     GREETING = "greeting"
@@ -24,255 +243,133 @@ class ConversationManager:
     """Manages conversation state for restaurant bookings"""
 
     def __init__(self):
-        # In-memory storage for conversations (in production, use Redis/database)
-        self.conversations = {}
+        # In-memory storage for conversations, used when REDIS_URL is not set.
+        # Kept in least-recently-updated order so expiry only looks at the front.
+        self.conversations = OrderedDict()
         self.conversation_timeout = 1800  # 30 minutes
+        self.max_conversations = 10000
+        # Turns run in worker threads (asyncio.to_thread), so every access to
+        # self.conversations goes through this lock
+        self._lock = threading.Lock()
+
+        # Shared Redis store so several gateway workers see the same call state
+        redis_url = os.getenv("REDIS_URL")
+        self.redis = redis.Redis.from_url(redis_url) if redis_url and redis else None
+        if redis_url and not redis:
+            logger.warning("⚠️ REDIS_URL is set but the redis package is not installed - using in-memory conversations")
 
     def _get_conversation_key(self, phone_number: str) -> str:
         """Generate conversation key from phone number"""
         return f"conv_{phone_number}"
 
     def _cleanup_expired_conversations(self):
-        """Remove expired conversations"""
-        current_time = datetime.now()
-        expired_keys = []
+        """Remove expired conversations, oldest first, stopping at the first live one (caller holds _lock)"""
+        cutoff = datetime.now() - timedelta(seconds=self.conversation_timeout)
 
-        for key, conv in self.conversations.items():
-            if (current_time - conv['last_updated']).seconds > self.conversation_timeout:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.conversations[key]
+        while self.conversations:
+            oldest = next(iter(self.conversations.values()))
+            if oldest['last_updated'] >= cutoff:
+                break
+            self.conversations.popitem(last=False)
+
+    def _new_conversation(self, phone_number: str) -> Dict[str, Any]:
+        """Build the initial state for a new conversation"""
+        return {
+            'phone_number': phone_number,
+            'state': BookingState.GREETING,
+            'booking_info': {
+                'party_size': None,
+                'date': None,
+                'time': None,
+                'guest_name': None,
+                'special_requests': None
+            },
+            'missing_info': [],
+            'last_updated': datetime.now(),
+            'attempts': 0
+        }
 
     def get_or_create_conversation(self, phone_number: str) -> Dict[str, Any]:
         """Get existing conversation or create new one"""
-        self._cleanup_expired_conversations()
+        key = self._get_conversation_key(phone_number)
+
+        if self.redis:
+            raw = self.redis.get(key)
+            if raw is None:
+                return self._new_conversation(phone_number)
+            conv = json.loads(raw)
+            conv['state'] = BookingState(conv['state'])
+            conv['last_updated'] = datetime.fromisoformat(conv['last_updated'])
+            return conv
+
+        with self._lock:
+            self._cleanup_expired_conversations()
+
+            if key not in self.conversations:
+                if len(self.conversations) >= self.max_conversations:
+                    # Evict the least recently updated conversation
+                    self.conversations.popitem(last=False)
+                self.conversations[key] = self._new_conversation(phone_number)
+
+            return self.conversations[key]
+
+    def save_conversation(self, phone_number: str, conv: Dict[str, Any]):
+        """Mark conversation as active and persist it to the shared store if configured"""
+        conv['last_updated'] = datetime.now()
 
         key = self._get_conversation_key(phone_number)
+        with self._lock:
+            if key in self.conversations:
+                self.conversations.move_to_end(key)
 
-        if key not in self.conversations:
-            self.conversations[key] = {
-                'phone_number': phone_number,
-                'state': BookingState.GREETING,
-                'booking_info': {
-                    'party_size': None,
-                    'date': None,
-                    'time': None,
-                    'guest_name': None,
-                    'special_requests': None
-                },
-                'missing_info': [],
-                'last_updated': datetime.now(),
-                'attempts': 0
-            }
-
-        return self.conversations[key]
+        if self.redis:
+            payload = dict(conv, state=conv['state'].value, last_updated=conv['last_updated'].isoformat())
+            # Redis expires idle conversations itself, replacing the in-memory cleanup scan
+            self.redis.setex(key, self.conversation_timeout, json.dumps(payload))
 
     def update_conversation(self, phone_number: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update conversation with new information"""
         conv = self.get_or_create_conversation(phone_number)
         conv.update(updates)
-        conv['last_updated'] = datetime.now()
+        self.save_conversation(phone_number, conv)
         return conv
 
     def parse_booking_request(self, user_text: str) -> Dict[str, Any]:
         """Parse natural language booking requests to extract information"""
-        parsed_info = {
-            'party_size': None,
-            'date': None,
-            'time': None,
-            'special_requests': None
-        }
+        return self._parse_lowered(user_text.lower())
 
-        user_lower = user_text.lower()
-
-        # Parse party size - be more specific to avoid confusion with times
-        party_patterns = [
-            r'(\d+)\s*(?:people|guests?|party|persons?)',
-            r'table\s+for\s+(\d+)',
-            r'party\s+of\s+(\d+)',
-            r'reservation\s+for\s+(\d+)',  # Add this pattern
-            r'for\s+(\d+)\s+(?:people|guests?|party|persons?)'  # More specific
-        ]
-
-        # Word to number mapping for common numbers
-        word_to_num = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
-            'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19, 'twenty': 20
-        }
-
-        word_patterns = [
-            r'(one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)\s*(?:people|guests?|party|persons?)',
-            r'table\s+for\s+(one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-            r'party\s+of\s+(one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-            r'reservation\s+for\s+(one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-            r'for\s+(one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)\s*(?:people|guests?|party|persons?)'
-        ]
-
-        # First try digit patterns
-        for pattern in party_patterns:
-            match = re.search(pattern, user_lower)
-            if match:
-                try:
-                    party_size = int(match.group(1))
-                    # Only accept reasonable party sizes (1-20)
-                    if 1 <= party_size <= 20:
-                        parsed_info['party_size'] = party_size
-                        break
-                except ValueError:
-                    continue
-
-        # If no digit match, try word patterns
-        if parsed_info['party_size'] is None:
-            for pattern in word_patterns:
-                match = re.search(pattern, user_lower)
-                if match:
-                    word = match.group(1).lower()
-                    if word in word_to_num:
-                        parsed_info['party_size'] = word_to_num[word]
-                        break
-
-        # Parse date
-        date_patterns = [
-            r'(\d{1,2})(?:st|nd|rd|th)?\s+(january|february|march|april|may|june|july|august|september|october|november|december)',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})(?:st|nd|rd|th)?',
-            r'tomorrow',
-            r'today',
-            r'next\s+(\w+)',
-            r'(\d{4}-\d{2}-\d{2})'  # YYYY-MM-DD format
-        ]
-
-        current_date = datetime.now()
-
-        # Check for relative dates first (these don't need regex matching)
-        if 'tomorrow' in user_lower:
-            parsed_date = current_date + timedelta(days=1)
-            parsed_info['date'] = parsed_date.strftime('%Y-%m-%d')
-        elif 'today' in user_lower or 'tonight' in user_lower:
-            parsed_info['date'] = current_date.strftime('%Y-%m-%d')
-
-        # Then check for specific date patterns
-        for pattern in date_patterns:
-            match = re.search(pattern, user_lower)
-            if match:
-                # Check which pattern matched based on the number of groups
-                if len(match.groups()) == 2:
-                    # Could be DD Month or Month DD format
-                    group1, group2 = match.group(1), match.group(2)
-                    if group1 and group1.isdigit() and group2:
-                        # DD Month format (e.g., "15 october")
-                        day = int(group1)
-                        month_name = group2.lower()
-                        month_map = {
-                            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-                            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
-                        }
-                        if month_name in month_map:
-                            year = current_date.year
-                            try:
-                                parsed_date = datetime(year, month_map[month_name], day)
-                                if parsed_date < current_date:
-                                    parsed_date = datetime(year + 1, month_map[month_name], day)
-                                parsed_info['date'] = parsed_date.strftime('%Y-%m-%d')
-                            except ValueError:
-                                continue
-                    elif group1 and group2 and group2.isdigit():
-                        # Month DD format (e.g., "october 15")
-                        month_name = group1.lower()
-                        day = int(group2)
-                        month_map = {
-                            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-                            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
-                        }
-                        if month_name in month_map:
-                            year = current_date.year
-                            try:
-                                parsed_date = datetime(year, month_map[month_name], day)
-                                if parsed_date < current_date:
-                                    parsed_date = datetime(year + 1, month_map[month_name], day)
-                                parsed_info['date'] = parsed_date.strftime('%Y-%m-%d')
-                            except ValueError:
-                                continue
-                elif len(match.groups()) == 1:
-                    # Could be YYYY-MM-DD or "next X"
-                    group1 = match.group(1)
-                    if group1 and len(group1) == 10 and '-' in group1:  # YYYY-MM-DD
-                        try:
-                            parsed_date = datetime.strptime(group1, '%Y-%m-%d')
-                            parsed_info['date'] = parsed_date.strftime('%Y-%m-%d')
-                        except ValueError:
-                            continue
-                    # Note: "next X" patterns are handled separately above
-                # "tomorrow" and "today" are handled separately above
-                break
-
-        # Parse time - be more specific to avoid confusion with party sizes
-        time_patterns = [
-            r'(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m|p\.m)',
-            r'(\d{1,2})(?::(\d{2}))?\s*o\'?clock',
-            r'at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m|p\.m)',
-            r'at\s+(\d{1,2})(?::(\d{2}))?',  # Require "at" for bare numbers
-        ]
-
-        for pattern in time_patterns:
-            match = re.search(pattern, user_lower)
-            if match:
-                hour = int(match.group(1))
-                minute = int(match.group(2)) if match.group(2) else 0
-                am_pm = match.group(3) if len(match.groups()) >= 3 else None
-
-                # Skip if this looks like a party size (single digit without time context)
-                if hour < 10 and not am_pm and 'at' not in user_lower and 'o\'clock' not in user_lower:
-                    continue
-
-                if am_pm:
-                    if am_pm.lower() in ['pm', 'p.m'] and hour != 12:
-                        hour += 12
-                    elif am_pm.lower() in ['am', 'a.m'] and hour == 12:
-                        hour = 0
-
-                try:
-                    parsed_time = datetime(2000, 1, 1, hour, minute)
-                    parsed_info['time'] = parsed_time.strftime('%H:%M')
-                    break
-                except ValueError:
-                    continue
-
-        # Parse special requests
-        special_keywords = [
-            'window', 'outside', 'patio', 'indoor', 'quiet', 'romantic',
-            'birthday', 'anniversary', 'celebration', 'vegan', 'vegetarian',
-            'gluten.free', 'allergic', 'wheelchair', 'accessible'
-        ]
-
-        special_parts = []
-        for keyword in special_keywords:
-            if keyword.replace('.', '') in user_lower:
-                special_parts.append(keyword)
-
-        if special_parts:
-            parsed_info['special_requests'] = ', '.join(special_parts)
-
-        return parsed_info
+    def _parse_lowered(self, user_lower: str) -> Dict[str, Any]:
+        """Parse already lower-cased text"""
+        # Callers merge into the result, so hand out a copy of the cached dict
+        return dict(_parse_booking_text(user_lower, date.today().toordinal()))
 
     def process_conversation_turn(self, phone_number: str, user_text: str, booking_system=None) -> Tuple[str, BookingState]:
         """Process a conversation turn and return response and new state"""
-        start_time = time.time()
         conv = self.get_or_create_conversation(phone_number)
+        response, state = self._process_turn(conv, phone_number, user_text, booking_system)
+        self.save_conversation(phone_number, conv)
+        return response, state
+
+    def _process_turn(self, conv: Dict[str, Any], phone_number: str, user_text: str, booking_system=None) -> Tuple[str, BookingState]:
+        """Apply one user message to the conversation state"""
+        start_time = time.perf_counter()
 
         # Parse the user's message for booking information FIRST
-        parse_start = time.time()
-        parsed_info = self.parse_booking_request(user_text)
-        parse_duration = time.time() - parse_start
-        logger.info(f"🔍 Conversation parsing: {parse_duration:.3f}s - Found: {parsed_info}")
-        print(f"📝 Parsed info: {parsed_info}")
+        parse_start = time.perf_counter()
+        # Lower-case once; the parser and keyword checks all work on this copy
+        user_lower = user_text.lower()
+        parsed_info = self._parse_lowered(user_lower)
+        parse_duration = time.perf_counter() - parse_start
+        logger.info("🔍 Conversation parsing: %.3fs - Found: %s", parse_duration, parsed_info)
 
         # Update booking info with parsed data (only if not None to avoid overwriting with None)
+        new_info = False
         for key, value in parsed_info.items():
             if value is not None:
                 conv['booking_info'][key] = value
+                new_info = True
 
-        print(f"📋 Updated booking info: {conv['booking_info']}")
+        logger.debug("📋 Updated booking info: %s", conv['booking_info'])
 
         # Try to extract guest name from the message if not already set
         if conv['booking_info']['guest_name'] is None:
@@ -280,10 +377,9 @@ class ConversationManager:
             if guest_name:
                 conv['booking_info']['guest_name'] = guest_name
 
-        # Determine what information is still missing
-        required_fields = ['party_size', 'date', 'time', 'guest_name']
-        missing_info = [field for field in required_fields if conv['booking_info'][field] is None]
-        print(f"❓ Missing info: {missing_info}")
+        # Determine what information is still missing (computed once per turn)
+        missing_info = self._get_missing_fields(conv)
+        logger.debug("❓ Missing info: %s", missing_info)
 
         # Handle different conversation states
         if conv['state'] == BookingState.GREETING:
@@ -301,11 +397,7 @@ class ConversationManager:
 
         elif conv['state'] == BookingState.CONFIRMING:
             # Check if new information was provided that might change the booking
-            old_missing = len([field for field in ['party_size', 'date', 'time', 'guest_name'] if conv['booking_info'][field] is None])
-            new_missing = len(missing_info)
-
-            # If we gained information (missing count decreased), or user is providing new booking details
-            if new_missing < old_missing or parsed_info and any(value is not None for value in parsed_info.values()):
+            if new_info:
                 # New information provided - go back to confirmation with updated details
                 if not missing_info:
                     return self._get_confirmation_response(conv), conv['state']
@@ -313,7 +405,7 @@ class ConversationManager:
                     # Still missing info, go back to gathering
                     conv['state'] = BookingState.GATHERING_INFO
                     return self._get_info_request_response(missing_info[0], conv), conv['state']
-            elif self._is_confirmation(user_text):
+            elif self._is_confirmation(user_lower):
                 # User confirmed, complete booking
                 if booking_system:
                     # Actually create the booking
@@ -336,15 +428,15 @@ class ConversationManager:
                     # No booking system, just mark as completed
                     conv['state'] = BookingState.COMPLETED
                     return self._get_completion_response(conv), conv['state']
-            elif self._is_change_request(user_text):
+            elif self._is_change_request(user_lower):
                 # User wants to change something
                 return self._handle_changes(user_text, conv), conv['state']
             else:
                 # Not a confirmation or change request, ask for clarification
                 return "Please say 'yes' or 'confirm' to proceed with the reservation, or let me know what you'd like to change.", conv['state']
 
-        total_duration = time.time() - start_time
-        logger.info(f"🧠 Conversation processing: {total_duration:.3f}s")
+        total_duration = time.perf_counter() - start_time
+        logger.info("🧠 Conversation processing: %.3fs", total_duration)
 
         return "I'm sorry, I didn't understand that. Could you please clarify?", conv['state']
 
@@ -373,8 +465,8 @@ class ConversationManager:
 
     def _get_missing_fields(self, conv: Dict) -> List[str]:
         """Get list of missing required fields"""
-        required = ['party_size', 'date', 'time', 'guest_name']
-        return [field for field in required if conv['booking_info'][field] is None]
+        booking_info = conv['booking_info']
+        return [field for field in REQUIRED_FIELDS if booking_info[field] is None]
 
     def _get_info_request_response(self, field: str, conv: Dict) -> str:
         """Get response asking for specific missing information"""
@@ -413,35 +505,17 @@ class ConversationManager:
         info = conv['booking_info']
         return f"Perfect! Your reservation for {info['party_size']} guests on {info['date']} at {info['time']} has been confirmed. We'll see you at Bella Vista!"
 
-    def _is_confirmation(self, user_text: str) -> bool:
-        """Check if user is confirming the booking"""
-        confirm_words = ['yes', 'confirm', 'correct', 'right', 'perfect', 'okay', 'sure', 'book it']
-        return any(word in user_text.lower() for word in confirm_words)
+    def _is_confirmation(self, user_lower: str) -> bool:
+        """Check if user is confirming the booking (expects lower-cased text)"""
+        return CONFIRMATION_PATTERN.search(user_lower) is not None
 
     def _extract_guest_name(self, user_text: str) -> Optional[str]:
         """Try to extract a guest name from the user's message"""
-        # Look for common name patterns
-        name_patterns = [
-            r'(?:my name is|i\'?m|this is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'for\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'under\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:party|reservation)'
-        ]
-
-        for pattern in name_patterns:
-            match = re.search(pattern, user_text, re.IGNORECASE)
-            if match:
-                name = match.group(1).strip()
-                # Basic validation - should be 2-50 chars, contain letters
-                if 2 <= len(name) <= 50 and any(c.isalpha() for c in name):
-                    return name.title()
-
-        return None
+        return _extract_name(user_text)
 
-    def _is_change_request(self, user_text: str) -> bool:
-        """Check if user is requesting to change booking details"""
-        change_words = ['change', 'different', 'modify', 'update', 'wrong', 'instead', 'rather']
-        return any(word in user_text.lower() for word in change_words)
+    def _is_change_request(self, user_lower: str) -> bool:
+        """Check if user is requesting to change booking details (expects lower-cased text)"""
+        return CHANGE_REQUEST_PATTERN.search(user_lower) is not None
 
     def _handle_changes(self, user_text: str, conv: Dict) -> str:
         """Handle user requests to change booking details"""
@@ -13,11 +13,24 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 from dotenv import load_dotenv
-import icalendar
 import base64
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import icalendar
+except ImportError:
+    # icalendar is optional - without it confirmation emails go out without a calendar invite
+    icalendar = None
 
 load_dotenv()
 
+# Twilio SMS sends run here while the SMTP email goes out on the calling thread
+SMS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sms")
+
+# str.translate table that strips whitespace, used to build placeholder guest emails
+WHITESPACE_DELETE = str.maketrans('', '', ' \t\n')
+
 class RestaurantNotificationService:
     """Comprehensive notification service for restaurant bookings"""
 
@@ -33,6 +46,9 @@ class RestaurantNotificationService:
         self.twilio_account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self.twilio_auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self.twilio_phone_number = os.getenv("TWILIO_PHONE_NUMBER")
+        # Keep-alive session so each SMS reuses the TLS connection to the Twilio API
+        self.session = requests.Session()
+        self.session.auth = (self.twilio_account_sid, self.twilio_auth_token)
 
         # Restaurant info
         self.restaurant_name = "Bella Vista"
@@ -52,14 +68,16 @@ class RestaurantNotificationService:
         }
 
         try:
+            # Start the SMS so it goes out while the email is being sent
+            sms_future = SMS_EXECUTOR.submit(self._send_confirmation_sms, booking_data)
             # Send email confirmation
             email_result = self._send_confirmation_email(booking_data)
             results['email_sent'] = email_result['success']
             if not email_result['success']:
                 results['errors'].append(f"Email error: {email_result['error']}")
 
-            # Send SMS confirmation
-            sms_result = self._send_confirmation_sms(booking_data)
+            # SMS confirmation was sent alongside the email
+            sms_result = sms_future.result()
             results['sms_sent'] = sms_result['success']
             if not sms_result['success']:
                 results['errors'].append(f"SMS error: {sms_result['error']}")
@@ -80,14 +98,16 @@ class RestaurantNotificationService:
         }
 
         try:
+            # Start the SMS so it goes out while the email is being sent
+            sms_future = SMS_EXECUTOR.submit(self._send_reminder_sms, booking_data, hours_before)
             # Send email reminder
             email_result = self._send_reminder_email(booking_data, hours_before)
             results['email_sent'] = email_result['success']
             if not email_result['success']:
                 results['errors'].append(f"Email error: {email_result['error']}")
 
-            # Send SMS reminder
-            sms_result = self._send_reminder_sms(booking_data, hours_before)
+            # SMS reminder was sent alongside the email
+            sms_result = sms_future.result()
             results['sms_sent'] = sms_result['success']
             if not sms_result['success']:
                 results['errors'].append(f"SMS error: {sms_result['error']}")
@@ -106,14 +126,16 @@ class RestaurantNotificationService:
         }
 
         try:
+            # Start the SMS so it goes out while the email is being sent
+            sms_future = SMS_EXECUTOR.submit(self._send_update_sms, booking_data, change_type)
             # Send email update
             email_result = self._send_update_email(booking_data, change_type)
             results['email_sent'] = email_result['success']
             if not email_result['success']:
                 results['errors'].append(f"Email error: {email_result['error']}")
 
-            # Send SMS update
-            sms_result = self._send_update_sms(booking_data, change_type)
+            # SMS update was sent alongside the email
+            sms_result = sms_future.result()
             results['sms_sent'] = sms_result['success']
             if not sms_result['success']:
                 results['errors'].append(f"SMS error: {sms_result['error']}")
@@ -123,10 +145,17 @@ class RestaurantNotificationService:
 
         return results
 
+    def _guest_email(self, booking: Dict[str, Any]) -> str:
+        """Guest's email, or a placeholder address derived from their name"""
+        guest_email = booking.get('guest_email')
+        if guest_email:
+            return guest_email
+        return f"{booking.get('guest_name', 'Guest').translate(WHITESPACE_DELETE).lower()}@example.com"
+
     def _send_confirmation_email(self, booking: Dict[str, Any]) -> Dict[str, Any]:
         """Send beautiful HTML email confirmation with calendar attachment"""
         try:
-            guest_email = booking.get('guest_email', f"{booking.get('guest_name', 'Guest').replace(' ', '').lower()}@example.com")
+            guest_email = self._guest_email(booking)
 
             # Create calendar attachment
             calendar_ics = self._generate_calendar_invite(booking)
@@ -190,14 +219,13 @@ class RestaurantNotificationService:
 
             # Using Twilio API
             url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
-            auth = (self.twilio_account_sid, self.twilio_auth_token)
             data = {
                 'From': self.twilio_phone_number,
                 'To': phone,
                 'Body': message
             }
 
-            response = requests.post(url, auth=auth, data=data)
+            response = self.session.post(url, data=data)
 
             if response.status_code == 201:
                 return {'success': True}
@@ -210,7 +238,7 @@ class RestaurantNotificationService:
     def _send_reminder_email(self, booking: Dict[str, Any], hours_before: int) -> Dict[str, Any]:
         """Send reminder email"""
         try:
-            guest_email = booking.get('guest_email', f"{booking.get('guest_name', 'Guest').replace(' ', '').lower()}@example.com")
+            guest_email = self._guest_email(booking)
 
             html_content = self._get_reminder_email_html(booking, hours_before)
             text_content = self._get_reminder_email_text(booking, hours_before)
@@ -251,14 +279,13 @@ class RestaurantNotificationService:
             message = self._get_reminder_sms_text(booking, hours_before)
 
             url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
-            auth = (self.twilio_account_sid, self.twilio_auth_token)
             data = {
                 'From': self.twilio_phone_number,
                 'To': phone,
                 'Body': message
             }
 
-            response = requests.post(url, auth=auth, data=data)
+            response = self.session.post(url, data=data)
 
             if response.status_code == 201:
                 return {'success': True}
@@ -271,7 +298,7 @@ class RestaurantNotificationService:
     def _send_update_email(self, booking: Dict[str, Any], change_type: str) -> Dict[str, Any]:
         """Send booking update email"""
         try:
-            guest_email = booking.get('guest_email', f"{booking.get('guest_name', 'Guest').replace(' ', '').lower()}@example.com")
+            guest_email = self._guest_email(booking)
 
             html_content = self._get_update_email_html(booking, change_type)
             text_content = self._get_update_email_text(booking, change_type)
@@ -312,14 +339,13 @@ class RestaurantNotificationService:
             message = self._get_update_sms_text(booking, change_type)
 
             url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
-            auth = (self.twilio_account_sid, self.twilio_auth_token)
             data = {
                 'From': self.twilio_phone_number,
                 'To': phone,
                 'Body': message
             }
 
-            response = requests.post(url, auth=auth, data=data)
+            response = self.session.post(url, data=data)
 
             if response.status_code == 201:
                 return {'success': True}
@@ -331,6 +357,9 @@ class RestaurantNotificationService:
 
     def _generate_calendar_invite(self, booking: Dict[str, Any]) -> Optional[str]:
         """Generate iCalendar (.ics) file for calendar integration"""
+        if icalendar is None:
+            return None
+
         try:
             cal = icalendar.Calendar()
             cal.add('prodid', '-//Bella Vista Reservation//')
@@ -648,3 +677,9 @@ class RestaurantNotificationService:
             return f"""✏️ Your Bella Vista reservation has been updated to {booking.get('date')} at {booking.get('time')} for {booking.get('party_size', 1)} guests."""
         else:
             return f"""📝 Your Bella Vista reservation has been {change_type}. Call {self.restaurant_phone} for details."""
+
+
+@lru_cache(maxsize=1)
+def get_notification_service() -> RestaurantNotificationService:
+    """Return the process-wide notification service so its HTTP session is reused"""
+    return RestaurantNotificationService()
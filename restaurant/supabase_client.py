@@ -3,12 +3,24 @@ Supabase client for restaurant booking database operations
 """
 
 import os
+import time
+from functools import lru_cache
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from typing import List, Dict, Optional, Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Keep slow PostgREST calls from holding a worker thread indefinitely
+SUPABASE_TIMEOUT = int(os.getenv("SUPABASE_TIMEOUT", "5"))
+
+# Guests that can be seated per time slot
+MAX_SLOT_CAPACITY = 8
+
+# Seconds a get_all_bookings result is reused by polling dashboards (writes invalidate it)
+BOOKINGS_CACHE_TTL = float(os.getenv("BOOKINGS_CACHE_TTL", "5"))
+
 class SupabaseRestaurantClient:
     """Supabase client for restaurant operations"""
 
@@ -20,14 +32,25 @@ class SupabaseRestaurantClient:
         if not all([self.supabase_url, self.supabase_key]):
             raise ValueError("Missing Supabase configuration in environment variables")
 
+        self.options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+
         # Create client with anon key for regular operations
-        self.client: Client = create_client(self.supabase_url, self.supabase_key)
+        self.client: Client = create_client(self.supabase_url, self.supabase_key, options=self.options)
 
-        # Create admin client with service role for admin operations
-        self.admin_client: Client = create_client(self.supabase_url, self.service_role_key)
+        # Admin client is created on first use (see admin_client)
+        self._admin_client: Optional[Client] = None
+
+        self._bookings_cache: Dict[int, tuple] = {}  # limit -> (fetched_at, result)
 
         print("🍽️ Supabase restaurant client initialized")
 
+    @property
+    def admin_client(self) -> Client:
+        """Client with the service role key, created the first time an admin operation runs"""
+        if self._admin_client is None:
+            self._admin_client = create_client(self.supabase_url, self.service_role_key, options=self.options)
+        return self._admin_client
+
     def initialize_tables(self):
         """Initialize database tables if they don't exist"""
         try:
@@ -41,6 +64,7 @@ class SupabaseRestaurantClient:
         """Create a new booking"""
         try:
             response = self.client.table('bookings').insert(booking_data).execute()
+            self._bookings_cache.clear()
             return {
                 'success': True,
                 'data': response.data[0] if response.data else None
@@ -73,6 +97,7 @@ class SupabaseRestaurantClient:
         """Update a booking"""
         try:
             response = self.client.table('bookings').update(updates).eq('id', booking_id).execute()
+            self._bookings_cache.clear()
             return len(response.data) > 0
         except Exception as e:
             print(f"❌ Error updating booking: {e}")
@@ -89,7 +114,7 @@ class SupabaseRestaurantClient:
             bookings = self.client.table('bookings').select('party_size').eq('date', date).eq('time', time_slot).eq('status', 'confirmed').execute()
 
             current_capacity = sum(booking['party_size'] for booking in bookings.data or [])
-            max_capacity = 8  # Max per table
+            max_capacity = MAX_SLOT_CAPACITY
 
             return {
                 'date': date,
@@ -108,14 +133,34 @@ class SupabaseRestaurantClient:
                 'error': str(e)
             }
 
+    def get_capacity_by_slot(self, date: str, time_slots: List[str]) -> Optional[Dict[str, int]]:
+        """Get booked guests per time slot for several slots on a date in one query"""
+        try:
+            bookings = self.client.table('bookings').select('time, party_size').eq('date', date).in_('time', time_slots).eq('status', 'confirmed').execute()
+
+            capacity = dict.fromkeys(time_slots, 0)
+            for booking in bookings.data or []:
+                time_slot = booking['time'][:5]  # time columns come back as HH:MM:SS
+                capacity[time_slot] = capacity.get(time_slot, 0) + booking['party_size']
+            return capacity
+        except Exception as e:
+            print(f"❌ Error checking availability: {e}")
+            return None
+
     def get_all_bookings(self, limit: int = 1000) -> Dict[str, Any]:
-        """Get all bookings (admin function)"""
+        """Get all bookings (admin function), reusing a result fetched in the last few seconds"""
+        cached = self._bookings_cache.get(limit)
+        if cached and time.monotonic() - cached[0] < BOOKINGS_CACHE_TTL:
+            return cached[1]
+
         try:
             response = self.admin_client.table('bookings').select('*').order('date', desc=True).order('time', desc=True).limit(limit).execute()
-            return {
+            result = {
                 'success': True,
                 'data': response.data or []
             }
+            self._bookings_cache[limit] = (time.monotonic(), result)
+            return result
         except Exception as e:
             print(f"❌ Error getting all bookings: {e}")
             return {
@@ -131,3 +176,9 @@ class SupabaseRestaurantClient:
             return True
         except:
             return False
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> SupabaseRestaurantClient:
+    """Return the process-wide Supabase client so its HTTP sessions are reused"""
+    return SupabaseRestaurantClient()
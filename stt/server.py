@@ -5,26 +5,104 @@ Real-time speech recognition for Twilio Media Streams
 """
 
 import os
-import json
+import time
+import orjson
 import base64
 import asyncio
+import contextlib
 import audioop
 import numpy as np
 from scipy.signal import resample_poly
 
 from fastapi import FastAPI, WebSocket
+from fastapi.responses import ORJSONResponse
 from whisperlivekit import TranscriptionEngine, AudioProcessor
 
 PUBLIC_HOST = os.getenv("PUBLIC_HOST", "your.domain.com")  # for TwiML
-
-app = FastAPI()
-engine = TranscriptionEngine(model="small", diarization=False, language="en")  # tweak as needed
+# How long to wait for more queued media frames before processing a batch, and the most
+# 20 ms frames folded into one batch; a longer window trades latency for fewer process_audio calls
+DRAIN_TIMEOUT_S = float(os.getenv("STT_DRAIN_TIMEOUT_MS", "5")) / 1000
+MAX_BATCH_FRAMES = int(os.getenv("STT_MAX_BATCH_FRAMES", "10"))
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "faster-whisper")  # CTranslate2 backend
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+# Optional pre-quantized CTranslate2 model, converted once with:
+#   ct2-transformers-converter --model openai/whisper-small --quantization int8 --output_dir models/whisper-small-int8
+WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR")
+# Optional time-stretch before the encoder: 2 halves encoder work per call at some WER cost,
+# acceptable for short constrained answers (names, party sizes, yes/no). 1 disables it.
+WHISPER_SPEED_UP = float(os.getenv("WHISPER_SPEED_UP", "1"))
+STRETCH_N_FFT = 512
+STRETCH_WINDOW_SAMPLES = 8 * STRETCH_N_FFT  # 256 ms @ 16k buffered per stretch so the STFT has enough frames
+# Optional CPU set for the STT process, e.g. "0-3" or "0,2,4"; unset leaves scheduling to the OS
+STT_CPU_AFFINITY = os.getenv("STT_CPU_AFFINITY")
+# Seconds of s16le silence @ 16k pushed through the model at startup
+WARMUP_AUDIO = b"\x00" * 32000 * int(os.getenv("STT_WARMUP_SECONDS", "2"))
+WARMUP_TIMEOUT_S = 30  # give up on warm-up rather than hold startup indefinitely
+WS_MAX_SIZE = 1_048_576  # Twilio media frames are a few hundred bytes; refuse anything near uvicorn's 16 MiB default
 
 # Configure logging
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("whisper")
 
+engine_kwargs = {}
+if WHISPER_MODEL_DIR:
+    engine_kwargs["model_dir"] = WHISPER_MODEL_DIR
+    logger.info("🎤 Loading Whisper model from %s (%s backend)", WHISPER_MODEL_DIR, WHISPER_BACKEND)
+else:
+    logger.info("🎤 Loading Whisper model '%s' (%s backend)", WHISPER_MODEL, WHISPER_BACKEND)
+
+if STT_CPU_AFFINITY and hasattr(os, "sched_setaffinity"):
+    # Set before the model loads so its worker threads inherit the CPU set
+    cpus = set()
+    for part in STT_CPU_AFFINITY.split(","):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    os.sched_setaffinity(0, cpus)
+    logger.info("🎤 Pinned STT process to CPUs %s", sorted(cpus))
+
+if WHISPER_SPEED_UP != 1:
+    import librosa  # only needed when time-stretching
+    logger.info("🎤 Speeding up audio %.1fx before transcription", WHISPER_SPEED_UP)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+engine = TranscriptionEngine(
+    model=WHISPER_MODEL,
+    backend=WHISPER_BACKEND,
+    diarization=False,
+    language="en",
+    pcm_input=True,  # frames are already decoded to s16le @ 16k below, skip the ffmpeg decoder
+    **engine_kwargs,
+)  # tweak as needed
+
+@app.on_event("startup")
+async def log_event_loop():
+    """Report which event loop implementation is serving requests"""
+    logger.info("🔁 Event loop: %s", type(asyncio.get_running_loop()).__module__)
+
+@app.on_event("startup")
+async def warm_up_engine():
+    """Run silence through the model so the first caller doesn't pay for warm-up"""
+    start_time = time.perf_counter()
+    processor = AudioProcessor(transcription_engine=engine)
+    results_gen = await processor.create_tasks()
+
+    async def drain_results():
+        async for _ in results_gen:
+            pass
+
+    try:
+        await processor.process_audio(WARMUP_AUDIO)
+        # An empty message ends the stream; waiting for the results to finish makes sure
+        # inference actually ran instead of tearing the processor down with audio still queued
+        await processor.process_audio(b"")
+        await asyncio.wait_for(drain_results(), timeout=WARMUP_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        logger.warning("⚠️ STT warm-up did not finish within %ss", WARMUP_TIMEOUT_S)
+    finally:
+        await processor.cleanup()
+    logger.info("🔥 STT warm-up: %.3fs", time.perf_counter() - start_time)
+
 @app.websocket("/media")
 async def twilio_media_stream(ws: WebSocket):
     """Handle Twilio Media Stream WebSocket connections"""
@@ -32,33 +110,76 @@ async def twilio_media_stream(ws: WebSocket):
     processor = AudioProcessor(transcription_engine=engine)
     results_gen = await processor.create_tasks()
 
+    stretch_buffer = []  # 16k float32 chunks awaiting time-stretch
+    stretch_buffered = 0
+
+    async def process_pcm(s16, flush=False):
+        """Feed 16k PCM to the processor, time-stretching it in full windows when enabled"""
+        nonlocal stretch_buffered
+        if WHISPER_SPEED_UP != 1:
+            stretch_buffer.append(s16.astype(np.float32))
+            stretch_buffered += len(s16)
+            if stretch_buffered < STRETCH_WINDOW_SAMPLES and not flush:
+                return
+            s16 = np.concatenate(stretch_buffer)
+            stretch_buffer.clear()
+            stretch_buffered = 0
+            if len(s16) >= STRETCH_N_FFT:
+                # Phase-vocoder time-stretch keeps pitch while shortening the audio
+                s16 = librosa.effects.time_stretch(s16, rate=WHISPER_SPEED_UP, n_fft=STRETCH_N_FFT)
+        if len(s16):
+            # Resampling and the vocoder can overshoot int16; clip rather than wrap around
+            await processor.process_audio(np.clip(s16, -32768, 32767).astype(np.int16).tobytes())
+
     async def handle_results():
         async for result in results_gen:
             # Forward transcription results to your LLM/agent bus
             # result includes partial/final transcripts
-            logger.info(f"🎤 STT: {result}")
+            logger.info("🎤 STT: %s", result)
 
-    asyncio.create_task(handle_results())
+    # Keep a reference so the task is not garbage collected mid-call and can be torn down with it
+    results_task = asyncio.create_task(handle_results())
 
     try:
-        while True:
+        stopped = False
+        while not stopped:
             # Twilio sends TEXT frames with JSON {event, media, ...}
             msg = await ws.receive_text()
-            data = json.loads(msg)
+            mulaw_chunks = []
+
+            # Drain whatever else is already queued so a burst of 20 ms frames
+            # is decoded, resampled and processed as a single buffer
+            while True:
+                data = orjson.loads(msg)
+
+                event = data.get("event")
+                if event == "media":
+                    mulaw_chunks.append(base64.b64decode(data["media"]["payload"]))  # μ-law @ 8k
+                    if len(mulaw_chunks) >= MAX_BATCH_FRAMES:
+                        break
+                elif event == "stop":
+                    stopped = True
+                    break
+                # handle "start"/"connected"/DTMF if needed
 
-            event = data.get("event")
-            if event == "media":
-                b64 = data["media"]["payload"]
-                mulaw = base64.b64decode(b64)                 # μ-law @ 8k
-                lin8k = audioop.ulaw2lin(mulaw, 2)            # -> int16 PCM @ 8k
+                try:
+                    msg = await asyncio.wait_for(ws.receive_text(), timeout=DRAIN_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    break
+
+            if mulaw_chunks:
+                lin8k = audioop.ulaw2lin(b"".join(mulaw_chunks), 2)  # -> int16 PCM @ 8k
                 s8 = np.frombuffer(lin8k, dtype=np.int16)
-                s16 = resample_poly(s8, up=2, down=1)         # -> 16k
-                await processor.process_audio(s16.astype(np.int16).tobytes())
-            elif event == "stop":
-                break
-            # handle "start"/"connected"/DTMF if needed
+                s16 = resample_poly(s8, up=2, down=1)                # -> 16k
+                await process_pcm(s16)
+
+        # Push out whatever is still waiting for a full stretch window
+        await process_pcm(np.empty(0, dtype=np.float32), flush=True)
     finally:
         await processor.cleanup()
+        results_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await results_task
 
 @app.get("/health")
 async def health_check():
@@ -71,6 +192,8 @@ async def health_check():
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8765))
-    logger.info(f"🎤 Starting WhisperLiveKit server on port {port}")
+    logger.info("🎤 Starting WhisperLiveKit server on port %s", port)
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Media frames are small base64 JSON at 50/s per call; compressing them costs more CPU than it saves
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools",
+                ws_per_message_deflate=False, ws_max_size=WS_MAX_SIZE)
@@ -0,0 +1,22 @@
+"""
+Regression tests for booking text parsing
+"""
+
+import unittest
+
+from restaurant.conversation_manager import ConversationManager
+
+
+class TimeParsingTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = ConversationManager()
+
+    def test_meridiem_time_beats_earlier_bare_at_time(self):
+        # A bare "at 5" earlier in the sentence must not turn a 7pm dinner into 5am
+        for text in ("table for 2 at 5, actually make it 7pm", "at 5 for dinner, 7pm"):
+            with self.subTest(text=text):
+                self.assertEqual(self.manager.parse_booking_request(text)['time'], '19:00')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
+import asyncio
 import requests
+import httpx
 import os
 import uuid
+import hashlib
 import time
 import logging
 from pathlib import Path
 from typing import Optional, Tuple
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 
 logger = logging.getLogger("concya.tts")
 
@@ -18,6 +22,14 @@ class ConcyaTTSClient:
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.audio_dir = Path("audio_cache")
         self.audio_dir.mkdir(exist_ok=True)
+        # Long-lived pooled HTTP/2 client so repeated TTS calls reuse TLS connections
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            http2=True,
+            timeout=30.0
+        )
+        self.async_client = AsyncOpenAI(api_key=self.api_key, http_client=self.http_client)
+        self._inflight = {}  # cache key -> synthesis task in progress
         print(f"🔊 TTS Client initialized - API Key loaded: {bool(self.api_key)}")
 
     def generate_speech(self, text: str, voice: str = "alloy", model: str = "tts-1") -> Optional[str]:
@@ -58,24 +70,24 @@ class ConcyaTTSClient:
             print(f"🎵 Generating TTS for: '{text[:50]}...' using voice '{voice}'")
 
             # Make API request
-            api_start_time = time.time()
+            api_start_time = time.perf_counter()
             response = requests.post(
                 "https://api.openai.com/v1/audio/speech",
                 json=payload,
                 headers=headers,
                 timeout=30
             )
-            api_duration = time.time() - api_start_time
-            logger.info(f"🔊 OpenAI TTS API call: {api_duration:.3f}s")
+            api_duration = time.perf_counter() - api_start_time
+            logger.info("🔊 OpenAI TTS API call: %.3fs", api_duration)
 
             response.raise_for_status()
 
             # Save audio file
-            file_start_time = time.time()
+            file_start_time = time.perf_counter()
             with open(audio_path, 'wb') as f:
                 f.write(response.content)
-            file_duration = time.time() - file_start_time
-            logger.info(f"💾 Audio file save: {file_duration:.3f}s")
+            file_duration = time.perf_counter() - file_start_time
+            logger.info("💾 Audio file save: %.3fs", file_duration)
 
             print(f"✅ Audio saved to: {audio_path}")
             return str(audio_path)
@@ -87,13 +99,96 @@ class ConcyaTTSClient:
             print(f"❌ TTS Error: {e}")
             return None
 
+    async def agenerate_speech(self, text: str, voice: str = "alloy", model: str = "tts-1") -> Optional[str]:
+        """
+        Async variant of generate_speech for use inside FastAPI handlers
+
+        Uses AsyncOpenAI so the event loop keeps serving other calls while
+        the TTS request is in flight.
+
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use ('alloy', 'echo', 'fable', 'onyx', 'nova', 'shimmer')
+            model: TTS model to use ('tts-1' or 'tts-1-hd')
+
+        Returns:
+            Path to generated audio file, or None if failed
+        """
+        try:
+            text = text.strip()
+            if not text:
+                return None
+
+            # Content-addressed filename: the same phrase maps to the same file,
+            # so repeat prompts (and restarts) skip the OpenAI round-trip
+            cache_key = hashlib.blake2b(f"{voice}|{model}|{text}".encode(), digest_size=16).hexdigest()
+            audio_path = self.audio_dir / f"{cache_key}.mp3"
+            if self._refresh_cached(audio_path):
+                logger.debug("⚡ TTS cache hit: '%.50s'", text)
+                return str(audio_path)
+
+            # Concurrent requests for the same phrase share one synthesis
+            task = self._inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(self._synthesize(text, voice, model, audio_path))
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+            await asyncio.shield(task)
+            return str(audio_path)
+
+        except Exception as e:
+            logger.error("❌ TTS Error: %s", e)
+            return None
+
+    def _refresh_cached(self, audio_path: Path) -> bool:
+        """Refresh a cached file's mtime so cleanup_old_files keeps it; False if it is missing or empty"""
+        try:
+            if audio_path.stat().st_size == 0:
+                return False
+            # utime never creates the file, unlike touch(), if cleanup removed it just now
+            os.utime(audio_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def _synthesize(self, text: str, voice: str, model: str, audio_path: Path):
+        """Stream OpenAI TTS audio to a temp file, then move it into place"""
+        logger.debug("🎵 Generating TTS for: '%.50s...' using voice '%s'", text, voice)
+
+        # Stream the audio to disk as it is synthesized instead of buffering the
+        # whole blob; the SDK writes through a thread-offloaded async file.
+        # MP3 is kept because Twilio <Play> cannot play Opus/AAC.
+        # Unique per writer: other workers may be synthesizing the same phrase
+        partial_path = audio_path.with_name(f"{audio_path.stem}.{uuid.uuid4().hex}.part")
+        api_start_time = time.perf_counter()
+        try:
+            async with self.async_client.audio.speech.with_streaming_response.create(
+                model=model,
+                input=text,
+                voice=voice,
+                response_format="mp3"
+            ) as response:
+                await response.stream_to_file(partial_path)
+            # Atomic rename so a cache hit never serves a half-written file
+            os.replace(partial_path, audio_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        api_duration = time.perf_counter() - api_start_time
+        logger.info("🔊 OpenAI TTS API call: %.3fs", api_duration)
+        logger.debug("✅ Audio saved to: %s", audio_path)
+
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self.http_client.aclose()
+
     def cleanup_old_files(self, max_age_minutes: int = 30):
         """Clean up old audio files to prevent disk space issues"""
         try:
             current_time = time.time()
             max_age_seconds = max_age_minutes * 60
 
-            for audio_file in self.audio_dir.glob("*.mp3"):
+            for audio_file in self.audio_dir.glob("*.*"):
                 if current_time - audio_file.stat().st_mtime > max_age_seconds:
                     audio_file.unlink()
                     print(f"🗑️ Cleaned up old audio file: {audio_file}")